@@ -4,7 +4,7 @@ Defines all configuration schemas with validation rules and defaults
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Union, Literal
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union, Literal
 from enum import Enum
 import re
 
@@ -44,6 +44,30 @@ class JobRole(Enum):
     SOCIAL_MEDIA = "Social Media"
 
 
+# Role values to members, so role strings can be checked without an exception per unknown value
+JOB_ROLES_BY_VALUE = {role.value: role for role in JobRole}
+
+
+def parse_job_roles(values: Iterable[Any]) -> Tuple[List[JobRole], List[Any]]:
+    """
+    Map role strings to JobRole members
+    
+    Args:
+        values: Role values as stored or sent by the client
+        
+    Returns:
+        Tuple of (known roles in input order, unrecognized values)
+    """
+    roles, unknown = [], []
+    for value in values:
+        role = JOB_ROLES_BY_VALUE.get(value) if isinstance(value, str) else None
+        if role is None:
+            unknown.append(value)
+        else:
+            roles.append(role)
+    return roles, unknown
+
+
 @dataclass
 class SmtpConfig:
     """SMTP configuration for email sending"""
@@ -6,24 +6,38 @@ Syncs Python configuration schema to Firebase and vice versa
 from typing import Dict, Any, Optional
 from firebase_admin import firestore
 from dataclasses import asdict
-import json
+from cachetools import TTLCache
+import copy
+import threading
 
 # Configure logging for Firebase Functions
 from utils.logging_config import get_logger
 logger = get_logger(__file__)
 
+from utils.firebase_utils import clear_api_keys_cache, config_cache_enabled
 from config_model import (
     GlobalConfig, ProjectConfig, SmtpConfig, ApiKeysConfig, 
     LeadFilterConfig, LocationConfig, JobRoleConfig, EnrichmentConfig,
-    EmailGenerationConfig, SchedulingConfig, JobRole
+    EmailGenerationConfig, SchedulingConfig, parse_job_roles
 )
 
 
+# Global config is spread over seven documents; reuse it across warm invocations
+GLOBAL_CONFIG_CACHE_TTL_SECONDS = 300
+
+# Project config is edited more often, so it is only reused briefly
+PROJECT_CONFIG_CACHE_TTL_SECONDS = 60
+
+
 class ConfigSyncManager:
     """Manages synchronization between Python config model and Firebase"""
     
     def __init__(self):
         self.db = firestore.client()
+        self._global_config_cache = TTLCache(maxsize=1, ttl=GLOBAL_CONFIG_CACHE_TTL_SECONDS)
+        self._global_config_lock = threading.Lock()
+        self._project_config_cache = TTLCache(maxsize=256, ttl=PROJECT_CONFIG_CACHE_TTL_SECONDS)
+        self._project_config_lock = threading.Lock()
     
     def sync_global_config_to_firebase(self, config: GlobalConfig) -> bool:
         """
@@ -108,6 +122,16 @@ class ConfigSyncManager:
         except Exception as e:
             logger.error(f"Error syncing global config to Firebase: {e}")
             return False
+        
+        finally:
+            # Some documents may have been written even if the sync failed
+            self.clear_global_config_cache()
+    
+    def clear_global_config_cache(self) -> None:
+        """Forget the cached global config (and API keys) so the next load reads Firebase"""
+        with self._global_config_lock:
+            self._global_config_cache.clear()
+        clear_api_keys_cache()
     
     def sync_project_config_to_firebase(self, config: ProjectConfig) -> bool:
         """
@@ -195,11 +219,26 @@ class ConfigSyncManager:
         except Exception as e:
             logger.error(f"Error syncing project config to Firebase: {e}")
             return False
+        
+        finally:
+            # Some documents may have been written even if the sync failed
+            with self._project_config_lock:
+                self._project_config_cache.pop(config.project_id, None)
     
     def load_global_config_from_firebase(self) -> GlobalConfig:
         """
         Load global configuration from Firebase
+        
+        Successful loads are cached for GLOBAL_CONFIG_CACHE_TTL_SECONDS; callers
+        always get their own copy, so mutating it does not affect the cache.
         """
+        use_cache = config_cache_enabled()
+        if use_cache:
+            with self._global_config_lock:
+                cached_config = self._global_config_cache.get('global')
+            if cached_config is not None:
+                return copy.deepcopy(cached_config)
+        
         try:
             config = GlobalConfig()
             
@@ -257,14 +296,8 @@ class ConfigSyncManager:
             job_roles_doc = self.db.collection('settings').document('jobRoles').get()
             if job_roles_doc.exists:
                 job_data = job_roles_doc.to_dict()
-                target_roles = []
-                for role_str in job_data.get('targetRoles', []):
-                    try:
-                        role = JobRole(role_str)
-                        target_roles.append(role)
-                    except ValueError:
-                        # Skip invalid roles
-                        pass
+                # Skip invalid roles
+                target_roles, _ = parse_job_roles(job_data.get('targetRoles', []))
                 
                 config.job_roles = JobRoleConfig(
                     target_roles=target_roles,
@@ -298,6 +331,9 @@ class ConfigSyncManager:
                 config.email_generation.followup_prompt = prompts_data.get('followupPrompt', config.email_generation.followup_prompt)
             
             logger.info("Global configuration loaded from Firebase successfully")
+            if use_cache:
+                with self._global_config_lock:
+                    self._global_config_cache['global'] = copy.deepcopy(config)
             return config
             
         except Exception as e:
@@ -307,7 +343,17 @@ class ConfigSyncManager:
     def load_project_config_from_firebase(self, project_id: str) -> ProjectConfig:
         """
         Load project-specific configuration from Firebase
+        
+        Successful loads are cached per project for PROJECT_CONFIG_CACHE_TTL_SECONDS;
+        callers always get their own copy.
         """
+        use_cache = config_cache_enabled()
+        if use_cache:
+            with self._project_config_lock:
+                cached_config = self._project_config_cache.get(project_id)
+            if cached_config is not None:
+                return copy.deepcopy(cached_config)
+        
         try:
             config = ProjectConfig(project_id=project_id)
             
@@ -359,13 +405,7 @@ class ConfigSyncManager:
                 job_roles_doc = self.db.collection('settings').document(f'project_{project_id}_jobRoles').get()
                 if job_roles_doc.exists:
                     job_data = job_roles_doc.to_dict()
-                    target_roles = []
-                    for role_str in job_data.get('targetRoles', []):
-                        try:
-                            role = JobRole(role_str)
-                            target_roles.append(role)
-                        except ValueError:
-                            pass
+                    target_roles, _ = parse_job_roles(job_data.get('targetRoles', []))
                     
                     config.job_roles = JobRoleConfig(
                         target_roles=target_roles,
@@ -394,6 +434,9 @@ class ConfigSyncManager:
                     )
             
             logger.info(f"Project {project_id} configuration loaded from Firebase successfully")
+            if use_cache:
+                with self._project_config_lock:
+                    self._project_config_cache[project_id] = copy.deepcopy(config)
             return config
             
         except Exception as e:
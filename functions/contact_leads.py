@@ -18,6 +18,7 @@ EUROPEAN_REGION = options.SupportedRegion.EUROPE_WEST1
 from utils import (
     OpenAIClient,
     EmailService,
+    get_cached_client,
     get_firestore_client,
     get_api_keys,
     get_project_settings,
@@ -76,7 +77,7 @@ def contact_leads_logic(request_data: Dict[str, Any], auth_uid: str = None) -> D
         if not api_keys.get('openai'):
             raise ValueError("OpenAI API key not configured")
         
-        openai_client = OpenAIClient(api_keys['openai'])
+        openai_client = get_cached_client(OpenAIClient, api_keys['openai'])
         email_service = EmailService()
         
         # Test email connection
@@ -4,6 +4,7 @@ Email Generation Function
 This function handles generating personalized emails using OpenAI and the configuration system.
 """
 
+import asyncio
 from typing import Dict, List, Optional, Any
 from firebase_functions import https_fn, options
 from firebase_admin import firestore
@@ -17,11 +18,17 @@ logger = get_logger(__file__)
 
 from utils import (
     OpenAIClient,
+    get_cached_client,
     get_firestore_client,
     get_api_keys
 )
+from utils.http_retry import AIMDConcurrencyLimiter
 from config_sync import get_config_sync
 
+# OpenAI requests in flight at once: start here, back off on 429s, grow up to the max
+EMAIL_GENERATION_CONCURRENCY = 8
+EMAIL_GENERATION_MAX_CONCURRENCY = 16
+
 
 def generate_emails_logic(request_data: Dict[str, Any], auth_uid: str = None) -> Dict[str, Any]:
     """
@@ -75,7 +82,7 @@ def generate_emails_logic(request_data: Dict[str, Any], auth_uid: str = None) ->
         if not api_keys.get('openai'):
             raise ValueError("OpenAI API key not configured")
         
-        openai_client = OpenAIClient(api_keys['openai'])
+        openai_client = get_cached_client(OpenAIClient, api_keys['openai'])
         
         # Get leads to generate emails for
         leads_to_process = []
@@ -103,61 +110,33 @@ def generate_emails_logic(request_data: Dict[str, Any], auth_uid: str = None) ->
         
         logger.info(f"Found {len(leads_to_process)} leads to process")
         
-        # Generate emails
+        # Get appropriate prompt
+        if custom_prompt:
+            prompt = custom_prompt
+        elif email_type == 'followup':
+            prompt = effective_config.email_generation.followup_prompt
+        else:
+            prompt = effective_config.email_generation.outreach_prompt
+        
+        # Generate emails concurrently
         generated_emails = []
         generation_errors = []
         
-        for lead in leads_to_process:
-            try:
-                # Get appropriate prompt
-                if custom_prompt:
-                    prompt = custom_prompt
-                elif email_type == 'followup':
-                    prompt = effective_config.email_generation.followup_prompt
-                else:
-                    prompt = effective_config.email_generation.outreach_prompt
-                
-                # Add project context to lead data
-                enhanced_lead_data = {
-                    **lead,
-                    'project_details': project_data.get('projectDetails', ''),
-                    'project_name': project_data.get('name', '')
-                }
-                
-                # Generate email content
-                email_content = openai_client.generate_email_content(
-                    lead_data=enhanced_lead_data,
-                    email_type=email_type,
-                    custom_prompt=prompt
-                )
-                
-                # Generate subject line
-                subject = generate_email_subject(lead, email_type, project_data)
-                
-                # Create email record
-                email_record = {
-                    'lead_id': lead['id'],
-                    'to_email': lead['email'],
-                    'to_name': lead.get('name'),
-                    'subject': subject,
-                    'content': email_content,
-                    'email_type': email_type,
-                    'generated_at': firestore.SERVER_TIMESTAMP,
-                    'project_id': project_id,
-                    'status': 'generated'
-                }
-                
-                generated_emails.append(email_record)
-                
-                logger.info(f"Successfully generated {email_type} email for lead: {lead.get('email', lead.get('name', 'Unknown'))}")
-                
-            except Exception as e:
-                logger.error(f"Failed to generate email for lead {lead.get('email')}: {e}")
+        generation_results = asyncio.run(_generate_all(
+            leads_to_process, openai_client, prompt, email_type, project_id, project_data
+        ))
+        
+        for lead, outcome in zip(leads_to_process, generation_results):
+            if isinstance(outcome, Exception):
+                logger.error("Failed to generate email for lead %s: %s", lead.get('email'), outcome)
                 generation_errors.append({
                     'lead_id': lead['id'],
                     'lead_email': lead.get('email'),
-                    'error': str(e)
+                    'error': str(outcome)
                 })
+            else:
+                generated_emails.append(outcome)
+                logger.info("Successfully generated %s email for lead: %s", email_type, lead.get('email', lead.get('name', 'Unknown')))
         
         # Return results
         result = {
@@ -181,6 +160,60 @@ def generate_emails_logic(request_data: Dict[str, Any], auth_uid: str = None) ->
         }
 
 
+async def _generate_all(leads: List[Dict[str, Any]],
+                        openai_client: OpenAIClient,
+                        prompt: str,
+                        email_type: str,
+                        project_id: str,
+                        project_data: Dict[str, Any]) -> List[Any]:
+    """
+    Generate emails for all leads concurrently
+    
+    Args:
+        leads: Leads to write emails for
+        openai_client: OpenAI API client
+        prompt: System prompt for the email
+        email_type: Type of email ('outreach' or 'followup')
+        project_id: Project ID recorded on each email
+        project_data: Project document data
+        
+    Returns:
+        One email record per lead (in input order), or the exception raised for that lead
+    """
+    limiter = AIMDConcurrencyLimiter(EMAIL_GENERATION_CONCURRENCY, maximum=EMAIL_GENERATION_MAX_CONCURRENCY)
+    
+    async def generate(lead: Dict[str, Any]) -> Dict[str, Any]:
+        # Add project context to lead data
+        enhanced_lead_data = {
+            **lead,
+            'project_details': project_data.get('projectDetails', ''),
+            'project_name': project_data.get('name', '')
+        }
+        
+        # The OpenAI client is synchronous, so run each call on a worker thread
+        async with limiter:
+            email_content = await asyncio.to_thread(
+                openai_client.generate_email_content,
+                lead_data=enhanced_lead_data,
+                email_type=email_type,
+                custom_prompt=prompt
+            )
+        
+        return {
+            'lead_id': lead['id'],
+            'to_email': lead['email'],
+            'to_name': lead.get('name'),
+            'subject': generate_email_subject(lead, email_type, project_data),
+            'content': email_content,
+            'email_type': email_type,
+            'generated_at': firestore.SERVER_TIMESTAMP,
+            'project_id': project_id,
+            'status': 'generated'
+        }
+    
+    return await asyncio.gather(*[generate(lead) for lead in leads], return_exceptions=True)
+
+
 @https_fn.on_call(region=EUROPEAN_REGION)
 def generate_emails(req: https_fn.CallableRequest) -> Dict[str, Any]:
     """
@@ -309,7 +342,7 @@ def preview_email_logic(request_data: Dict[str, Any], auth_uid: str = None) -> D
         if not api_keys.get('openai'):
             raise ValueError("OpenAI API key not configured")
         
-        openai_client = OpenAIClient(api_keys['openai'])
+        openai_client = get_cached_client(OpenAIClient, api_keys['openai'])
         
         # Get appropriate prompt
         if custom_prompt:
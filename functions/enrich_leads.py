@@ -5,8 +5,9 @@ This function enriches existing leads with Perplexity research and additional da
 Can be used to re-enrich leads or enrich leads that were added without enrichment.
 """
 
-from typing import Dict, List, Optional, Any
-from firebase_functions import https_fn, options
+import asyncio
+from typing import Dict, List, Optional, Any, Awaitable, Callable
+from firebase_functions import https_fn, tasks_fn, options
 
 # Configure European region
 EUROPEAN_REGION = options.SupportedRegion.EUROPE_WEST1
@@ -19,12 +20,23 @@ logger = get_logger(__file__)
 from utils import (
     PerplexityClient,
     LeadProcessor,
+    get_cached_client,
+    FirestoreCache,
+    make_cache_key,
     get_firestore_client,
     get_api_keys,
     get_project_settings
 )
+from utils.http_retry import AIMDConcurrencyLimiter
 from config_sync import get_config_sync
 
+# Perplexity requests in flight at once: start here, back off on 429s, grow up to the max
+ENRICHMENT_CONCURRENCY = 8
+ENRICHMENT_MAX_CONCURRENCY = 16
+
+# Perplexity research is cached per (company, person, prompt) for 30 days
+_PERPLEXITY_CACHE = FirestoreCache('perplexity_cache', ttl_seconds=30 * 24 * 3600)
+
 
 def enrich_leads_logic(request_data: Dict[str, Any], auth_uid: str = None) -> Dict[str, Any]:
     """
@@ -85,7 +97,7 @@ def enrich_leads_logic(request_data: Dict[str, Any], auth_uid: str = None) -> Di
         if not api_keys.get('perplexity'):
             raise ValueError("Perplexity API key not configured")
         
-        perplexity_client = PerplexityClient(api_keys['perplexity'])
+        perplexity_client = get_cached_client(PerplexityClient, api_keys['perplexity'])
         lead_processor = LeadProcessor()
         
         # Get leads to enrich
@@ -132,71 +144,36 @@ def enrich_leads_logic(request_data: Dict[str, Any], auth_uid: str = None) -> Di
         
         logger.info(f"Found {len(leads_to_enrich)} leads to enrich")
         
-        # Enrich leads
+        # Enrich leads concurrently - each lead is an independent Perplexity round-trip
+        enrichment_results = asyncio.run(_enrich_all(
+            leads_to_enrich,
+            db,
+            perplexity_client,
+            effective_config.enrichment,
+            enrichment_type,
+            project_data.get('projectDetails'),
+            use_cache=not force_re_enrich
+        ))
+        
         enriched_count = 0
         failed_count = 0
         batch = db.batch()
         
-        for lead in leads_to_enrich:
-            enrichment_success = False
-            enrichment_attempts = 0
-            enrichment_error = None
+        for lead, outcome in zip(leads_to_enrich, enrichment_results):
+            if isinstance(outcome, Exception):
+                # A task that blew up outside the retry loop still counts as a failed lead
+                logger.error("Enrichment task failed for lead %s: %s", lead.get('email', 'Unknown'), outcome)
+                outcome = {
+                    'success': False,
+                    'enrichment_data': {},
+                    'attempts': 0,
+                    'error': str(outcome)
+                }
             
-            while enrichment_attempts < effective_config.enrichment.max_retries and not enrichment_success:
-                enrichment_attempts += 1
-                
-                try:
-                    enrichment_data = {}
-                    
-                    # Prepare enrichment prompt using configured template
-                    company_name = lead.get('company', '')
-                    person_name = lead.get('name', '')
-                    person_title = lead.get('title', '')
-                    
-                    if company_name and (enrichment_type in ['company', 'both']):
-                        # Format the enrichment prompt
-                        formatted_prompt = effective_config.enrichment.prompt_template.format(
-                            company=company_name,
-                            name=person_name,
-                            title=person_title
-                        )
-                        
-                        # Add project context
-                        if project_data.get('projectDetails'):
-                            formatted_prompt += f"\n\nProject Context: {project_data['projectDetails']}"
-                        
-                        # Call Perplexity with configured timeout
-                        enrichment_response = perplexity_client.enrich_lead_data(
-                            company_name=company_name,
-                            person_name=person_name if enrichment_type in ['person', 'both'] else None,
-                            additional_context=formatted_prompt,
-                            timeout=effective_config.enrichment.timeout_seconds
-                        )
-                        
-                        if enrichment_response and enrichment_response.get('choices'):
-                            content = enrichment_response['choices'][0]['message']['content']
-                            
-                            if validate_enrichment_data({'content': content}):
-                                enrichment_data['enrichment_content'] = content
-                                enrichment_data['enrichment_timestamp'] = firestore.SERVER_TIMESTAMP
-                                enrichment_data['enrichment_source'] = 'perplexity'
-                                enrichment_data['enrichment_prompt_used'] = formatted_prompt
-                                enrichment_success = True
-                            else:
-                                logger.warning(f"Enrichment data failed validation for lead: {lead.get('email', 'Unknown')}")
-                                enrichment_error = "Enrichment data failed quality validation"
-                        else:
-                            enrichment_error = "No response from Perplexity API"
-                    else:
-                        enrichment_error = "Missing required data for enrichment (company name)"
-                        break  # Don't retry if we don't have the required data
-                    
-                except Exception as e:
-                    enrichment_error = str(e)
-                    logger.warning(f"Enrichment attempt {enrichment_attempts} failed for lead {lead.get('email', 'Unknown')}: {e}")
-                    
-                    if enrichment_attempts < effective_config.enrichment.max_retries:
-                        logger.info(f"Retrying enrichment for lead {lead.get('email', 'Unknown')} (attempt {enrichment_attempts + 1})")
+            enrichment_success = outcome['success']
+            enrichment_data = outcome['enrichment_data']
+            enrichment_attempts = outcome['attempts']
+            enrichment_error = outcome['error']
             
             # Update lead based on enrichment result
             try:
@@ -214,7 +191,7 @@ def enrich_leads_logic(request_data: Dict[str, Any], auth_uid: str = None) -> Di
                     batch.update(lead_ref, update_data)
                     enriched_count += 1
                     
-                    logger.info(f"Successfully enriched lead: {lead.get('email', lead.get('name', 'Unknown'))}")
+                    logger.info("Successfully enriched lead: %s", lead.get('email', lead.get('name', 'Unknown')))
                 else:
                     # Mark as failed
                     update_data = {
@@ -227,10 +204,10 @@ def enrich_leads_logic(request_data: Dict[str, Any], auth_uid: str = None) -> Di
                     batch.update(lead_ref, update_data)
                     failed_count += 1
                     
-                    logger.warning(f"Failed to enrich lead after {enrichment_attempts} attempts: {lead.get('email', lead.get('name', 'Unknown'))}")
+                    logger.warning("Failed to enrich lead after %d attempts: %s", enrichment_attempts, lead.get('email', lead.get('name', 'Unknown')))
                     
             except Exception as batch_error:
-                logger.error(f"Failed to update lead status: {batch_error}")
+                logger.error("Failed to update lead status: %s", batch_error)
                 failed_count += 1
         
         # Commit batch updates
@@ -273,6 +250,165 @@ def enrich_leads_logic(request_data: Dict[str, Any], auth_uid: str = None) -> Di
         }
 
 
+async def _enrich_all(leads: List[Dict[str, Any]],
+                      db: Any,
+                      perplexity_client: PerplexityClient,
+                      enrichment_config: Any,
+                      enrichment_type: str,
+                      project_details: Optional[str] = None,
+                      use_cache: bool = True) -> List[Any]:
+    """
+    Enrich all leads concurrently over one shared HTTP session
+    
+    Leads that produce an identical Perplexity request (same company, person and
+    prompt) share a single API call instead of each paying for their own.
+    
+    Args:
+        leads: Leads to enrich
+        db: Firestore client (used for the Perplexity cache)
+        perplexity_client: Perplexity API client
+        enrichment_config: EnrichmentConfig from the effective project config
+        enrichment_type: Type of enrichment ('company', 'person', 'both')
+        project_details: Project description appended to the prompt (optional)
+        use_cache: Reuse cached Perplexity research when available
+        
+    Returns:
+        One result dict per lead (in input order), or the exception raised by that lead's task
+    """
+    limiter = AIMDConcurrencyLimiter(ENRICHMENT_CONCURRENCY, maximum=ENRICHMENT_MAX_CONCURRENCY)
+    requests_by_key: Dict[str, asyncio.Task] = {}
+    
+    async with perplexity_client.create_session() as session:
+        
+        async def fetch(cache_key: str, company_name: str, person_name: Optional[str], prompt: str) -> Dict[str, Any]:
+            # Call Perplexity with configured timeout. The adaptive concurrency cap is applied
+            # per attempt, so a slot is not held while backing off and every 429 shrinks it
+            response = await perplexity_client.aenrich_lead_data(
+                session,
+                company_name=company_name,
+                person_name=person_name,
+                additional_context=prompt,
+                timeout=enrichment_config.timeout_seconds,
+                concurrency_limiter=limiter
+            )
+            
+            if response and response.get('choices'):
+                content = response['choices'][0]['message']['content']
+                if validate_enrichment_data({'content': content}):
+                    await asyncio.to_thread(_PERPLEXITY_CACHE.set, db, cache_key, {'content': content})
+                    return response
+            
+            # Unusable answer: forget it so the next retry issues a fresh request
+            if requests_by_key.get(cache_key) is asyncio.current_task():
+                del requests_by_key[cache_key]
+            return response
+        
+        async def research(company_name: str, person_name: Optional[str], prompt: str) -> Dict[str, Any]:
+            cache_key = make_cache_key(company_name, person_name, prompt)
+            
+            if use_cache:
+                cached = await asyncio.to_thread(_PERPLEXITY_CACHE.get, db, cache_key)
+                if cached:
+                    return {'choices': [{'message': {'content': cached.get('content', '')}}]}
+            
+            # Join an identical request that is already in flight (or already answered)
+            request = requests_by_key.get(cache_key)
+            if request is None:
+                request = asyncio.ensure_future(fetch(cache_key, company_name, person_name, prompt))
+                requests_by_key[cache_key] = request
+            
+            try:
+                return await request
+            except Exception:
+                # Let the next retry issue a fresh request
+                if requests_by_key.get(cache_key) is request:
+                    del requests_by_key[cache_key]
+                raise
+        
+        return await asyncio.gather(
+            *[
+                _enrich_one(lead, research, enrichment_config, enrichment_type, project_details)
+                for lead in leads
+            ],
+            return_exceptions=True
+        )
+
+
+async def _enrich_one(lead: Dict[str, Any],
+                      research: Callable[[str, Optional[str], str], Awaitable[Dict[str, Any]]],
+                      enrichment_config: Any,
+                      enrichment_type: str,
+                      project_details: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Enrich a single lead, retrying up to the configured number of attempts
+    
+    Returns:
+        Dict with 'success', 'enrichment_data', 'attempts' and 'error'
+    """
+    enrichment_success = False
+    enrichment_attempts = 0
+    enrichment_error = None
+    enrichment_data = {}
+    
+    while enrichment_attempts < enrichment_config.max_retries and not enrichment_success:
+        enrichment_attempts += 1
+        
+        try:
+            enrichment_data = {}
+            
+            # Prepare enrichment prompt using configured template
+            company_name = lead.get('company', '')
+            person_name = lead.get('name', '')
+            person_title = lead.get('title', '')
+            
+            if company_name and (enrichment_type in ['company', 'both']):
+                # Format the enrichment prompt
+                formatted_prompt = enrichment_config.prompt_template.format(
+                    company=company_name,
+                    name=person_name,
+                    title=person_title
+                )
+                
+                # Add project context
+                if project_details:
+                    formatted_prompt += f"\n\nProject Context: {project_details}"
+                
+                research_person = person_name if enrichment_type in ['person', 'both'] else None
+                enrichment_response = await research(company_name, research_person, formatted_prompt)
+                
+                if enrichment_response and enrichment_response.get('choices'):
+                    content = enrichment_response['choices'][0]['message']['content']
+                    
+                    if validate_enrichment_data({'content': content}):
+                        enrichment_data['enrichment_content'] = content
+                        enrichment_data['enrichment_timestamp'] = firestore.SERVER_TIMESTAMP
+                        enrichment_data['enrichment_source'] = 'perplexity'
+                        enrichment_data['enrichment_prompt_used'] = formatted_prompt
+                        enrichment_success = True
+                    else:
+                        logger.warning("Enrichment data failed validation for lead: %s", lead.get('email', 'Unknown'))
+                        enrichment_error = "Enrichment data failed quality validation"
+                else:
+                    enrichment_error = "No response from Perplexity API"
+            else:
+                enrichment_error = "Missing required data for enrichment (company name)"
+                break  # Don't retry if we don't have the required data
+            
+        except Exception as e:
+            enrichment_error = str(e)
+            logger.warning("Enrichment attempt %d failed for lead %s: %s", enrichment_attempts, lead.get('email', 'Unknown'), e)
+            
+            if enrichment_attempts < enrichment_config.max_retries:
+                logger.info("Retrying enrichment for lead %s (attempt %d)", lead.get('email', 'Unknown'), enrichment_attempts + 1)
+    
+    return {
+        'success': enrichment_success,
+        'enrichment_data': enrichment_data,
+        'attempts': enrichment_attempts,
+        'error': enrichment_error
+    }
+
+
 @https_fn.on_call(region=EUROPEAN_REGION)
 def enrich_leads(req: https_fn.CallableRequest) -> Dict[str, Any]:
     """
@@ -308,6 +444,28 @@ def enrich_leads(req: https_fn.CallableRequest) -> Dict[str, Any]:
         )
 
 
+@tasks_fn.on_task_dispatched(
+    region=EUROPEAN_REGION,
+    retry_config=options.RetryConfig(max_attempts=3, min_backoff_seconds=60),
+    rate_limits=options.RateLimits(max_concurrent_dispatches=2)
+)
+def enrich_leads_task(req: tasks_fn.CallableRequest) -> None:
+    """
+    Cloud Tasks handler for enrichment queued by find_leads
+    
+    Args:
+        req: Task request whose data is an enrich_leads request
+        (project_id, lead_ids, enrichment_type)
+    """
+    result = enrich_leads_logic(req.data)
+    
+    if not result.get('success', True):
+        # Raising makes Cloud Tasks retry the task (up to max_attempts)
+        raise RuntimeError(f"Enrichment task failed: {result.get('error', 'Unknown error')}")
+    
+    logger.info(f"Enrichment task completed: {result.get('message', 'Success')}")
+
+
 def get_enrichment_status_logic(request_data: Dict[str, Any], auth_uid: str = None) -> Dict[str, Any]:
     """
     Business logic for getting enrichment status - separated from Firebase Functions decorator
@@ -5,11 +5,20 @@ This function searches for leads using Apollo.io and optionally triggers enrichm
 Enrichment is now handled by the separate enrich_leads function.
 """
 
+import re
 import sys
+import logging
+import math
 import time
-from typing import Dict, List, Optional, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple, Any
+from cachetools import TTLCache
 from firebase_functions import https_fn, options
-from firebase_admin import firestore
+from firebase_admin import firestore, functions
+from google.cloud.firestore_v1.bulk_writer import BulkRetry, BulkWriterOptions
+from google.rpc import code_pb2
 
 # Configure logging for Firebase Functions
 from utils.logging_config import get_logger
@@ -21,12 +30,63 @@ EUROPEAN_REGION = options.SupportedRegion.EUROPE_WEST1
 from utils import (
     ApolloClient, 
     LeadProcessor,
+    OpenAIClient,
+    get_cached_client,
     get_firestore_client,
     get_api_keys,
-    get_project_settings
+    get_project_settings,
+    config_cache_enabled
 )
 from config_sync import get_config_sync
-from location_processor import location_processor
+from location_processor import location_processor, location_cache_key
+from utils.http_retry import get_rate_limit_retry_after
+
+# Fields read from existing leads for duplicate and company filtering
+EXISTING_LEAD_FIELDS = ['email', 'company', 'linkedinUrl']
+
+# Maximum number of values in a Firestore 'in' filter
+FIRESTORE_IN_QUERY_LIMIT = 30
+
+# Cloud Tasks function that enriches leads saved by a search (see enrich_leads.py)
+ENRICHMENT_TASK_FUNCTION = 'enrich_leads_task'
+
+# Attempts per lead write before BulkWriter gives up on it, backing off exponentially
+# between attempts so contention or throttling isn't hammered with immediate retries
+BULK_WRITE_MAX_ATTEMPTS = 5
+BULK_WRITER_OPTIONS = BulkWriterOptions(retry=BulkRetry.exponential)
+
+# gRPC status of a create whose document is already there
+ALREADY_EXISTS = code_pb2.ALREADY_EXISTS
+
+# Project documents by ID. Projects are edited from the web app, so keep the TTL
+# short enough that a changed areaDescription is picked up on the next search.
+_PROJECT_CACHE = TTLCache(maxsize=256, ttl=60)
+
+# The global blacklist, briefly reused across searches. contact_leads re-reads it
+# before sending, so a just-blacklisted address can never be emailed from here.
+_BLACKLIST_CACHE = TTLCache(maxsize=1, ttl=60)
+
+# The project and blacklist caches are filled from worker threads
+_cache_lock = threading.Lock()
+
+# Simple patterns for cities, states, countries (see extract_location_from_description)
+_LOCATION_PATTERNS = [
+    re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s*[A-Z]{2}\b'),  # City, State
+    re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s*[A-Z][a-z]+\b'),  # City, Country
+    re.compile(r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b')  # Two-word locations
+]
+
+# Broad location indicators (countries, large states, etc.) for _validate_location_narrowness
+_BROAD_LOCATION_INDICATORS = (
+    'united states', 'usa', 'america', 'germany', 'austria', 'switzerland', 'france', 'italy',
+    'california', 'texas', 'new york', 'florida', 'illinois', 'pennsylvania',
+    'bavaria', 'baden-württemberg', 'north rhine-westphalia',
+    'europe', 'north america', 'asia'
+)
+
+# Worker threads for the independent Firestore/API reads at the start of a search,
+# kept for the life of the instance so warm invocations don't spawn new threads
+_io_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='find-leads-io')
 
 
 def find_leads_logic(request_data: Dict[str, Any], auth_uid: str = None) -> Dict[str, Any]:
@@ -49,7 +109,7 @@ def find_leads_logic(request_data: Dict[str, Any], auth_uid: str = None) -> Dict
     start_time = time.time()
     
     try:
-        logger.info(f"Starting find_leads for project: {request_data.get('project_id')}")
+        logger.info("Starting find_leads for project: %s", request_data.get('project_id'))
         # Extract parameters from request
         project_id = request_data.get('project_id')
         num_leads = request_data.get('num_leads', 25)
@@ -60,36 +120,50 @@ def find_leads_logic(request_data: Dict[str, Any], auth_uid: str = None) -> Dict
         if not project_id:
             raise ValueError("project_id is required")
         
-        logger.info(f"Finding leads for project: {project_id}")
+        logger.info("Finding leads for project: %s", project_id)
         
-        # Get project details from Firestore
         db = get_firestore_client()
         project_ref = db.collection('projects').document(project_id)
-        project_doc = project_ref.get()
+        config_sync = get_config_sync()
         
-        if not project_doc.exists:
-            raise ValueError(f"Project {project_id} not found")
+        # Issue the independent reads concurrently. The blacklist is only needed after
+        # the Apollo search, so its latency is hidden behind it.
+        project_future = _io_executor.submit(_get_project, project_ref)
+        api_keys_future = _io_executor.submit(get_api_keys)
+        project_config_future = _io_executor.submit(config_sync.load_project_config_from_firebase, project_id)
+        global_config_future = _io_executor.submit(config_sync.load_global_config_from_firebase)
+        blacklist_future = _io_executor.submit(_load_blacklisted_emails, db)
         
-        project_data = project_doc.to_dict()
+        # Get project details (cached briefly across warm invocations)
+        project_data = project_future.result()
+        
+        if project_data is None:
+            raise ValueError(f"Project {project_id} not found")
         
         # Initialize API clients
-        api_keys = get_api_keys()
+        api_keys = api_keys_future.result()
         
         if not api_keys.get('apollo'):
             raise ValueError("Apollo API key not configured")
         
-        apollo_client = ApolloClient(api_keys['apollo'])
+        apollo_client = get_cached_client(ApolloClient, api_keys['apollo'])
         lead_processor = LeadProcessor()
         
         # Load project configuration
-        config_sync = get_config_sync()
-        project_config = config_sync.load_project_config_from_firebase(project_id)
-        global_config = config_sync.load_global_config_from_firebase()
+        project_config = project_config_future.result()
+        global_config = global_config_future.result()
         effective_config = project_config.get_effective_config(global_config)
+        lead_filter = effective_config.lead_filter
+        
+        # Company filtering needs every company in the project, so scan the project's leads
+        # behind the Apollo search. Otherwise only the found people are looked up afterwards.
+        existing_future = None
+        if lead_filter.one_person_per_company:
+            existing_future = _io_executor.submit(_load_existing_leads, db, project_id)
         
         # Prepare search parameters based on project configuration
         apollo_search_params = {
-            'per_page': min(num_leads, 100),  # Apollo API limit
+            'per_page': min(num_leads, 100),  # Apollo API limit; further pages are fetched as needed
             'page': 1
         }
         
@@ -98,7 +172,9 @@ def find_leads_logic(request_data: Dict[str, Any], auth_uid: str = None) -> Dict
             project_data, 
             effective_config.location,
             location_processor,
-            api_keys
+            api_keys,
+            project_ref,
+            db
         )
         apollo_search_params.update(location_params)
         
@@ -106,17 +182,16 @@ def find_leads_logic(request_data: Dict[str, Any], auth_uid: str = None) -> Dict
         target_roles = effective_config.job_roles.get_all_roles()
         if target_roles:
             apollo_search_params['person_titles'] = target_roles
-            logger.info(f"Targeting job roles: {target_roles}")
-        
-        # Add lead filtering parameters
-        if effective_config.lead_filter.min_company_size:
-            apollo_search_params['organization_num_employees_ranges'] = [f"{effective_config.lead_filter.min_company_size}+"]
+            logger.info("Targeting job roles: %s", target_roles)
         
-        if effective_config.lead_filter.max_company_size:
-            if 'organization_num_employees_ranges' not in apollo_search_params:
-                apollo_search_params['organization_num_employees_ranges'] = []
-            # Apollo uses specific ranges, we'll simplify for now
-            apollo_search_params['organization_num_employees_ranges'].append(f"1-{effective_config.lead_filter.max_company_size}")
+        # Add lead filtering parameters (Apollo uses specific ranges, we'll simplify for now)
+        employee_ranges = []
+        if lead_filter.min_company_size:
+            employee_ranges.append(f"{lead_filter.min_company_size}+")
+        if lead_filter.max_company_size:
+            employee_ranges.append(f"1-{lead_filter.max_company_size}")
+        if employee_ranges:
+            apollo_search_params['organization_num_employees_ranges'] = employee_ranges
         
         # Merge custom search parameters (these can override config)
         apollo_search_params.update(search_params)
@@ -126,12 +201,12 @@ def find_leads_logic(request_data: Dict[str, Any], auth_uid: str = None) -> Dict
         if not validation_result['valid']:
             raise ValueError(validation_result['error'])
         
-        logger.info(f"Searching Apollo with params: {apollo_search_params}")
+        logger.info("Searching Apollo with params: %s", apollo_search_params)
         
-        # Search for leads using Apollo.io
-        apollo_results = apollo_client.search_people(**apollo_search_params)
+        # Search Apollo.io (existing leads and blacklist are still loading in the background)
+        apollo_results = apollo_client.search_people_pages(num_leads, **apollo_search_params)
         
-        logger.info(f"Apollo returned {len(apollo_results.get('people', []))} results")
+        logger.info("Apollo returned %s results", len(apollo_results.get('people', [])))
         
         if not apollo_results.get('people'):
             return {
@@ -142,51 +217,72 @@ def find_leads_logic(request_data: Dict[str, Any], auth_uid: str = None) -> Dict
                 'enrichment_triggered': False
             }
         
-        # Process Apollo results
+        # Process Apollo results, then drop the raw payload (full person and organization
+        # records for every page) so it isn't held through filtering and the writes
         processed_leads = lead_processor.process_apollo_results(apollo_results)
-        logger.info(f"Processed {len(processed_leads)} leads from Apollo")
+        logger.info("Processed %s leads from Apollo", len(processed_leads))
         
-        # Get existing leads for filtering
-        existing_leads_query = db.collection('leads').where('projectId', '==', project_id).stream()
-        existing_leads = [doc.to_dict() for doc in existing_leads_query]
-        logger.info(f"Found {len(existing_leads)} existing leads in database")
+        pagination = {key: apollo_results.get(key) for key in ('partial', 'next_page', 'retry_after')}
+        del apollo_results
+        
+        if existing_future is not None:
+            existing_leads = existing_future.result()
+        else:
+            existing_leads = _load_matching_leads(db, project_id, processed_leads)
+        logger.info("Found %s existing leads in database", len(existing_leads))
         
         # Get blacklisted emails
-        blacklisted_emails = []
-        try:
-            blacklist_ref = db.collection('blacklist').document('emails')
-            blacklist_doc = blacklist_ref.get()
-            if blacklist_doc.exists:
-                blacklist_data = blacklist_doc.to_dict()
-                blacklisted_emails = blacklist_data.get('list', [])
-        except Exception as e:
-            logger.warning(f"Could not load blacklist: {e}")
-        
-        # Apply comprehensive lead filtering
+        blacklisted_emails = blacklist_future.result()
+        
+        # Apply comprehensive lead filtering, dropping people already in this project (by email
+        # or LinkedIn) or repeated within this batch in the same pass
         original_count = len(processed_leads)
-        filtered_leads = lead_processor.apply_lead_filters(
+        filtered_leads, duplicate_count = lead_processor.apply_lead_filters(
             processed_leads,
-            effective_config.lead_filter,
+            lead_filter,
             existing_leads,
-            blacklisted_emails
+            blacklisted_emails,
+            drop_duplicates=True
         )
         
         # Get filtering statistics
         filter_stats = lead_processor.get_filtering_stats(
             original_count,
             len(filtered_leads),
-            effective_config.lead_filter
+            lead_filter
         )
-        logger.info(f"Filtered {original_count} leads down to {len(filtered_leads)}")
-        
-        # Final duplicate check (this is now mainly for cross-project duplicates)
-        unique_leads = lead_processor.check_duplicate_leads(filtered_leads, existing_leads)
-        logger.info(f"Found {len(unique_leads)} unique leads after filtering")
+        logger.info("Filtered %s leads down to %s unique leads (%s duplicates)",
+                    original_count, len(filtered_leads), duplicate_count)
+        unique_leads = filtered_leads
         
-        # Save leads to Firestore
-        saved_count = 0
-        batch = db.batch()
+        # Save leads to Firestore (BulkWriter pipelines the writes and retries transient failures)
         saved_lead_ids = []
+        failed_lead_ids = set()
+        conflicting_lead_ids = set()
+        
+        def _on_write_error(error, bulk_writer) -> bool:
+            lead_id = error.operation.reference.id
+            if error.code == ALREADY_EXISTS:
+                if error.attempts == 0:
+                    # The document existed before this create ran, so a retry can't have landed
+                    conflicting_lead_ids.add(lead_id)
+                elif lead_id not in conflicting_lead_ids:
+                    # An earlier attempt of this create landed but its response was lost -
+                    # the lead is saved (IDs are random, so this is never someone else's doc)
+                    return False
+            if error.attempts < BULK_WRITE_MAX_ATTEMPTS:
+                return True
+            failed_lead_ids.add(lead_id)
+            logger.error("Failed to save lead %s: %s", lead_id, error.message)
+            return False
+        
+        bulk_writer = db.bulk_writer(options=BULK_WRITER_OPTIONS)
+        bulk_writer.on_write_error(_on_write_error)
+        
+        leads_collection = db.collection('leads')
+        enrichment_status = 'pending' if auto_enrich else None
+        # One timestamp for the whole search: plain values serialize without a per-document transform
+        created_at = datetime.now(timezone.utc)
         
         for lead in unique_leads:
             try:
@@ -194,39 +290,36 @@ def find_leads_logic(request_data: Dict[str, Any], auth_uid: str = None) -> Dict
                 db_lead = lead_processor.prepare_lead_for_database(lead, project_id)
                 
                 # Set initial enrichment status
-                db_lead['enrichmentStatus'] = 'pending' if auto_enrich else None
-                db_lead['createdAt'] = firestore.SERVER_TIMESTAMP
+                db_lead['enrichmentStatus'] = enrichment_status
+                db_lead['createdAt'] = created_at
                 
-                # Add to batch
-                lead_ref = db.collection('leads').document()
-                batch.set(lead_ref, db_lead)
+                # Queue the write
+                lead_ref = leads_collection.document()
+                bulk_writer.create(lead_ref, db_lead)
                 saved_lead_ids.append(lead_ref.id)
-                saved_count += 1
                 
             except Exception as e:
-                logger.error(f"Failed to prepare lead for database: {e}")
+                logger.error("Failed to prepare lead for database: %s", e)
+        
+        # Wait for all queued writes to complete
+        bulk_writer.close()
+        saved_lead_ids = [lead_id for lead_id in saved_lead_ids if lead_id not in failed_lead_ids]
+        saved_count = len(saved_lead_ids)
         
-        # Commit batch
         enrichment_triggered = False
         if saved_count > 0:
-            batch.commit()
-            logger.info(f"Saved {saved_count} leads to database")
+            logger.info("Saved %s leads to database", saved_count)
             
-            # Update project lead count
-            current_count = len(existing_leads)
-            new_count = current_count + saved_count
+            # Update project lead count atomically so concurrent searches don't lose updates
             project_ref.update({
-                'leadCount': new_count,
+                'leadCount': firestore.Increment(saved_count),
                 'lastLeadSearch': firestore.SERVER_TIMESTAMP
             })
-            logger.info(f"Updated project lead count to {new_count}")
+            logger.info("Incremented project lead count by %s", saved_count)
             
-            # Trigger enrichment if requested
+            # Trigger enrichment if requested (queued, so the caller doesn't wait for Perplexity)
             if auto_enrich and api_keys.get('perplexity'):
                 try:
-                    # Import here to avoid circular imports
-                    from enrich_leads import enrich_leads_logic
-                    
                     # Create enrichment request data
                     enrichment_data = {
                         'project_id': project_id,
@@ -235,13 +328,13 @@ def find_leads_logic(request_data: Dict[str, Any], auth_uid: str = None) -> Dict
                     }
                     
                     # Trigger enrichment
-                    enrichment_result = enrich_leads_logic(enrichment_data, auth_uid)
+                    _enqueue_enrichment(enrichment_data)
                     enrichment_triggered = True
                     
-                    logger.info(f"Enrichment triggered: {enrichment_result.get('message', 'Success')}")
+                    logger.info("Enrichment queued for %s leads", len(saved_lead_ids))
                     
                 except Exception as e:
-                    logger.warning(f"Failed to trigger automatic enrichment: {e}")
+                    logger.warning("Failed to trigger automatic enrichment: %s", e)
                     if not save_without_enrichment:
                         # If we don't want to save without enrichment, rollback
                         # Note: This is complex with Firestore, so we'll just log the error
@@ -252,21 +345,38 @@ def find_leads_logic(request_data: Dict[str, Any], auth_uid: str = None) -> Dict
             'success': True,
             'message': f'Successfully found and added {saved_count} new leads',
             'leads_found': len(processed_leads),
-            'leads_filtered': len(filtered_leads),
+            # Leads that passed the non-duplicate filters (duplicates are dropped in the same pass)
+            'leads_filtered': len(filtered_leads) + duplicate_count,
             'leads_added': saved_count,
-            'duplicates_filtered': len(filtered_leads) - len(unique_leads),
+            'duplicates_filtered': duplicate_count,
             'total_filtered_out': len(processed_leads) - len(unique_leads),
             'project_id': project_id,
             'enrichment_triggered': enrichment_triggered,
             'saved_lead_ids': saved_lead_ids if auto_enrich else None,
-            'filtering_stats': filter_stats
+            'filtering_stats': filter_stats,
+            'partial': pagination['partial'] or False
         }
         
-        logger.info(f"Find leads completed successfully: {saved_count} leads added")
+        if result['partial']:
+            # Apollo rate limited a later page - tell the caller where to resume
+            result['next_page'] = pagination['next_page']
+            result['retry_after'] = math.ceil(pagination['retry_after'] or 0)
+        
+        logger.info("Find leads completed successfully: %s leads added", saved_count)
         return result
         
     except Exception as e:
-        logger.error(f"Error in find_leads: {str(e)}")
+        retry_after = get_rate_limit_retry_after(e)
+        if retry_after is not None:
+            logger.warning("find_leads rate limited by upstream API, retry after %ss", retry_after)
+            return {
+                'success': False,
+                'error': 'rate_limited',
+                'error_type': 'RateLimited',
+                'retry_after': math.ceil(retry_after)
+            }
+        
+        logger.error("Error in find_leads: %s", e)
         return {
             'success': False,
             'error': str(e),
@@ -274,6 +384,132 @@ def find_leads_logic(request_data: Dict[str, Any], auth_uid: str = None) -> Dict
         }
 
 
+def _get_project(project_ref) -> Optional[Dict[str, Any]]:
+    """
+    Get a project document, reusing a recent read from this instance
+    
+    Args:
+        project_ref: Firestore reference to the project document
+        
+    Returns:
+        Copy of the project data, or None if the project does not exist
+    """
+    use_cache = config_cache_enabled()
+    project_data = None
+    if use_cache:
+        with _cache_lock:
+            project_data = _PROJECT_CACHE.get(project_ref.id)
+    
+    if project_data is None:
+        project_doc = project_ref.get()
+        if not project_doc.exists:
+            return None
+        project_data = project_doc.to_dict()
+        if use_cache:
+            with _cache_lock:
+                _PROJECT_CACHE[project_ref.id] = project_data
+    
+    return dict(project_data)
+
+
+def _enqueue_enrichment(enrichment_data: Dict[str, Any]) -> None:
+    """
+    Queue an enrich_leads_task run for newly saved leads
+    
+    Args:
+        enrichment_data: enrich_leads request data (project_id, lead_ids, enrichment_type)
+    """
+    queue = functions.task_queue(f"locations/{EUROPEAN_REGION.value}/functions/{ENRICHMENT_TASK_FUNCTION}")
+    queue.enqueue(enrichment_data)
+
+
+def _load_blacklisted_emails(db) -> frozenset:
+    """
+    Load the global email blacklist
+    
+    Args:
+        db: Firestore client
+        
+    Returns:
+        Normalized (stripped, lowercased) blacklisted email addresses (empty if the blacklist is missing or unreadable)
+    """
+    use_cache = config_cache_enabled()
+    if use_cache:
+        with _cache_lock:
+            blacklisted_emails = _BLACKLIST_CACHE.get('emails')
+        if blacklisted_emails is not None:
+            return blacklisted_emails
+    
+    try:
+        blacklist_doc = db.collection('blacklist').document('emails').get()
+        blacklisted_emails = frozenset()
+        if blacklist_doc.exists:
+            blacklisted_emails = frozenset(email.strip().lower() for email in blacklist_doc.to_dict().get('list', []) if email)
+        if use_cache:
+            with _cache_lock:
+                _BLACKLIST_CACHE['emails'] = blacklisted_emails
+        return blacklisted_emails
+    except Exception as e:
+        logger.warning("Could not load blacklist: %s", e)
+    
+    return frozenset()
+
+
+def _load_existing_leads(db, project_id: str) -> List[Dict[str, Any]]:
+    """
+    Load the project's existing leads for duplicate and company filtering
+    
+    Only the fields the filters need are fetched.
+    
+    Args:
+        db: Firestore client
+        project_id: Project ID
+        
+    Returns:
+        List of existing lead dicts (email, company and LinkedIn URL only)
+    """
+    existing_leads_query = db.collection('leads').where('projectId', '==', project_id).select(EXISTING_LEAD_FIELDS).stream()
+    return [doc.to_dict() for doc in existing_leads_query]
+
+
+def _load_matching_leads(db, project_id: str, leads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Load only the project's existing leads that share an email or LinkedIn URL with the given leads
+    
+    Uses batched 'in' queries (run concurrently), so the cost scales with the number of
+    new leads instead of the size of the project. Matching is done on the normalized
+    identity fields, plus the raw fields for leads stored before those existed.
+    
+    Args:
+        db: Firestore client
+        project_id: Project ID
+        leads: Processed leads to look up
+        
+    Returns:
+        List of matching existing lead dicts (email, company and LinkedIn URL only)
+    """
+    project_leads = db.collection('leads').where('projectId', '==', project_id)
+    identities = [LeadProcessor.lead_identity(lead) for lead in leads]
+    emails = {email for email, _ in identities if email}
+    linkedin_urls = {linkedin_url for _, linkedin_url in identities if linkedin_url}
+    lookups = {
+        'emailNormalized': sorted(emails),
+        'linkedinUrlNormalized': sorted(linkedin_urls),
+        'email': sorted(emails | {lead['email'] for lead in leads if lead.get('email')}),
+        'linkedinUrl': sorted({lead['linkedin_url'] for lead in leads if lead.get('linkedin_url')})
+    }
+    
+    futures = []
+    for field, values in lookups.items():
+        for start in range(0, len(values), FIRESTORE_IN_QUERY_LIMIT):
+            query = project_leads.where(field, 'in', values[start:start + FIRESTORE_IN_QUERY_LIMIT])
+            futures.append(_io_executor.submit(
+                lambda query=query: [doc.to_dict() for doc in query.select(EXISTING_LEAD_FIELDS).stream()]
+            ))
+    
+    return [lead for future in futures for lead in future.result()]
+
+
 @https_fn.on_call(region=EUROPEAN_REGION)
 def find_leads(req: https_fn.CallableRequest) -> Dict[str, Any]:
     """
@@ -289,6 +525,14 @@ def find_leads(req: https_fn.CallableRequest) -> Dict[str, Any]:
         auth_uid = req.auth.uid if req.auth else None
         result = find_leads_logic(req.data, auth_uid)
         
+        # Upstream rate limits get their own code so the client can schedule a retry
+        if result.get('error_type') == 'RateLimited':
+            raise https_fn.HttpsError(
+                code=https_fn.FunctionsErrorCode.RESOURCE_EXHAUSTED,
+                message='rate_limited',
+                details={'retry_after': result['retry_after'], 'code': 'agent.rate_limited'}
+            )
+        
         # If there was an error in business logic, convert to HttpsError
         if not result.get('success', True):
             raise https_fn.HttpsError(
@@ -302,7 +546,7 @@ def find_leads(req: https_fn.CallableRequest) -> Dict[str, Any]:
         # Re-raise HttpsError as-is
         raise
     except Exception as e:
-        logger.error(f"Error in find_leads Firebase Function: {str(e)}")
+        logger.error("Error in find_leads Firebase Function: %s", e)
         raise https_fn.HttpsError(
             code=https_fn.FunctionsErrorCode.INTERNAL,
             message=f"Failed to find leads: {str(e)}"
@@ -313,7 +557,9 @@ def _process_project_location(
     project_data: Dict[str, Any], 
     location_config: Any,
     location_processor: Any,
-    api_keys: Dict[str, str]
+    api_keys: Dict[str, str],
+    project_ref: Any = None,
+    db: Any = None
 ) -> Dict[str, Any]:
     """
     Process project location using areaDescription and LocationProcessor LLM capabilities
@@ -323,6 +569,8 @@ def _process_project_location(
         location_config: LocationConfig from effective config
         location_processor: LocationProcessor instance
         api_keys: Available API keys
+        project_ref: Project document reference, used to persist the parsed locations (optional)
+        db: Firestore client for the shared parse cache (optional)
         
     Returns:
         Dict with Apollo API location parameters (using clean location strings)
@@ -334,19 +582,12 @@ def _process_project_location(
         logger.warning("Project areaDescription is not set - this is required for proper location targeting")
         raise ValueError("Project areaDescription must be set for location targeting. Please update the project settings.")
     
-    logger.info(f"Processing project areaDescription: '{area_description}'")
-    
-    # Check for OpenAI API key - now mandatory for location processing
-    if not api_keys.get('openai'):
-        raise ValueError("OpenAI API key is required for location processing. Please configure the OpenAI API key in your settings.")
-    
-    # Initialize OpenAI client for LLM parsing
-    from openai import OpenAI
-    location_processor.openai_client = OpenAI(api_key=api_keys['openai'])
+    logger.info("Processing project areaDescription: '%s'", area_description)
     
     try:
-        # Use LocationProcessor to parse areaDescription with LLM (now returns location strings)
-        clean_locations, parsed_info = location_processor.parse_location_with_llm(area_description)
+        clean_locations, parsed_info = _parse_area_description(
+            area_description, location_processor, api_keys, project_data, project_ref, db
+        )
         
         if clean_locations:
             # Use clean location strings for both person and organization targeting
@@ -355,21 +596,21 @@ def _process_project_location(
                 'organization_locations': clean_locations
             }
             
-            logger.info(f"🎯 LOCATION TARGETING STRATEGY:")
-            logger.info(f"📍 Original input: '{area_description}'")
-            logger.info(f"🔍 Clean locations: {clean_locations}")
-            logger.info(f"📊 Parsing method: {parsed_info.get('method', 'unknown')}")
-            logger.info(f"🎚️ Confidence: {parsed_info.get('confidence', 'unknown')}")
+            logger.info("🎯 LOCATION TARGETING STRATEGY:")
+            logger.info("📍 Original input: '%s'", area_description)
+            logger.info("🔍 Clean locations: %s", clean_locations)
+            logger.info("📊 Parsing method: %s", parsed_info.get('method', 'unknown'))
+            logger.info("🎚️ Confidence: %s", parsed_info.get('confidence', 'unknown'))
             
             if parsed_info.get('ignored_details'):
-                logger.info(f"🚫 Ignored broad areas: {parsed_info['ignored_details']}")
+                logger.info("🚫 Ignored broad areas: %s", parsed_info['ignored_details'])
             
             # Validate that locations are appropriately narrow
             narrow_validation = _validate_location_narrowness(clean_locations, area_description)
             if narrow_validation['warning']:
-                logger.warning(f"⚠️ LOCATION WARNING: {narrow_validation['warning']}")
+                logger.warning("⚠️ LOCATION WARNING: %s", narrow_validation['warning'])
             
-            logger.info(f"✅ Location targeting ready: {len(clean_locations)} specific location(s)")
+            logger.info("✅ Location targeting ready: %s specific location(s)", len(clean_locations))
                 
             return location_params
                 
@@ -383,13 +624,72 @@ def _process_project_location(
         # Re-raise ValueError as-is (these are user-facing errors)
         raise
     except Exception as e:
-        logger.error(f"Error processing location with LLM: {e}")
+        logger.error("Error processing location with LLM: %s", e)
         raise ValueError(
             f"Failed to process location '{area_description}': {str(e)}. "
             "Please ensure the OpenAI API key is configured and the location description is clear."
         )
 
 
+def _parse_area_description(
+    area_description: str,
+    location_processor: Any,
+    api_keys: Dict[str, str],
+    project_data: Dict[str, Any],
+    project_ref: Any = None,
+    db: Any = None
+) -> Tuple[List[str], Dict[str, Any]]:
+    """
+    Parse an areaDescription with the LLM, reusing earlier parses of the same text
+    
+    A parse stored on the project document (parsedLocations/locationsHash) is used
+    first, then the location processor's shared cache. Only a miss on both calls OpenAI.
+    
+    Args:
+        area_description: Stripped areaDescription of the project
+        location_processor: LocationProcessor instance
+        api_keys: Available API keys
+        project_data: Project data from Firestore
+        project_ref: Project document reference to persist a fresh parse to (optional)
+        db: Firestore client for the shared location cache (defaults to the app's client)
+        
+    Returns:
+        Tuple of (clean_location_strings, parsed_info)
+    """
+    locations_hash = location_cache_key(area_description)
+    
+    if project_data.get('locationsHash') == locations_hash and project_data.get('parsedLocations'):
+        logger.info("Reusing parsed locations stored on the project")
+        return list(project_data['parsedLocations']), {'method': 'stored on project'}
+    
+    # Share the pooled OpenAI client with the other functions on this instance. The key is
+    # only required on a cache miss, where the processor raises if there is no client.
+    openai_client = None
+    if api_keys.get('openai'):
+        openai_client = get_cached_client(OpenAIClient, api_keys['openai']).client
+    
+    # Use LocationProcessor to parse areaDescription with LLM (now returns location strings)
+    clean_locations, parsed_info = location_processor.parse_location_cached(area_description, openai_client, db)
+    
+    if clean_locations:
+        if project_ref is not None:
+            stored_parse = {'parsedLocations': clean_locations, 'locationsHash': locations_hash}
+            try:
+                project_ref.update(stored_parse)
+            except Exception as e:
+                # Persisting is only an optimization - the next search just parses again
+                logger.warning("Could not store parsed locations on project: %s", e)
+            else:
+                # Keep this instance's cached project in step, or every search until the
+                # entry expires would miss the stored parse and write it again
+                with _cache_lock:
+                    cached_project = _PROJECT_CACHE.get(project_ref.id)
+                    if cached_project is not None:
+                        _PROJECT_CACHE[project_ref.id] = {**cached_project, **stored_parse}
+    
+    return clean_locations, parsed_info
+
+
 def _validate_location_narrowness(locations: List[str], original_input: str) -> Dict[str, Any]:
     """
     Validate that locations are appropriately narrow for effective targeting
@@ -401,26 +701,18 @@ def _validate_location_narrowness(locations: List[str], original_input: str) ->
     Returns:
         Dict with validation results and warnings
     """
-    # Broad location indicators (countries, large states, etc.)
-    broad_indicators = [
-        'united states', 'usa', 'america', 'germany', 'austria', 'switzerland', 'france', 'italy',
-        'california', 'texas', 'new york', 'florida', 'illinois', 'pennsylvania',
-        'bavaria', 'baden-württemberg', 'north rhine-westphalia',
-        'europe', 'north america', 'asia'
-    ]
-    
     warnings = []
     
     # Check for overly broad locations
     for location in locations:
         location_lower = location.lower().strip()
-        for broad_term in broad_indicators:
+        # Allow things like "Linz, Austria" but flag standalone broad terms
+        has_city_indicator = any(city_indicator in location_lower for city_indicator in (',', 'city', 'district'))
+        for broad_term in _BROAD_LOCATION_INDICATORS:
             if location_lower == broad_term:
                 warnings.append(f"'{location}' is too broad - will match entire country/state")
-            elif broad_term in location_lower and len(location_lower) <= len(broad_term) + 10:
-                # Allow things like "Linz, Austria" but flag standalone broad terms
-                if not any(city_indicator in location_lower for city_indicator in [',', 'city', 'district']):
-                    warnings.append(f"'{location}' may be too broad for effective targeting")
+            elif not has_city_indicator and broad_term in location_lower and len(location_lower) <= len(broad_term) + 10:
+                warnings.append(f"'{location}' may be too broad for effective targeting")
     
     # Check for mixed specificity levels
     city_count = 0
@@ -431,7 +723,7 @@ def _validate_location_narrowness(locations: List[str], original_input: str) ->
         # Simple heuristic: if it contains comma, likely city+country; if short and broad, likely country
         if ',' in location or any(indicator in location_lower for indicator in ['city', 'district', 'borough']):
             city_count += 1
-        elif any(broad in location_lower for broad in broad_indicators):
+        elif any(broad in location_lower for broad in _BROAD_LOCATION_INDICATORS):
             country_count += 1
     
     if city_count > 0 and country_count > 0:
@@ -522,20 +814,21 @@ def _validate_apollo_search_params(apollo_search_params: Dict[str, Any]) -> Dict
             'error': 'Organization size ranges parameter is present but empty.'
         }
     
-    # Log validated parameters for debugging
-    logger.info(f"✅ APOLLO SEARCH PARAMETERS VALIDATED:")
-    logger.info(f"🎯 Person locations: {person_locations}")
-    logger.info(f"🏢 Organization locations: {organization_locations}")
-    logger.info(f"👔 Person titles: {person_titles}")
-    if contact_email_status:
-        logger.info(f"📧 Contact email status: {contact_email_status}")
-    if org_size_ranges:
-        logger.info(f"👥 Organization size ranges: {org_size_ranges}")
-    
-    # Show location targeting strategy
-    total_locations = len(set(person_locations + organization_locations))
-    logger.info(f"📊 TARGETING SCOPE: {total_locations} unique location(s), {len(person_titles)} job role(s)")
-    logger.info(f"🎚️ Strategy: Narrow location targeting (avoids broad areas for precise results)")
+    # Log validated parameters for debugging (skipped entirely when INFO is filtered out)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("✅ APOLLO SEARCH PARAMETERS VALIDATED:")
+        logger.info("🎯 Person locations: %s", person_locations)
+        logger.info("🏢 Organization locations: %s", organization_locations)
+        logger.info("👔 Person titles: %s", person_titles)
+        if contact_email_status:
+            logger.info("📧 Contact email status: %s", contact_email_status)
+        if org_size_ranges:
+            logger.info("👥 Organization size ranges: %s", org_size_ranges)
+        
+        # Show location targeting strategy
+        total_locations = len(set(person_locations).union(organization_locations))
+        logger.info("📊 TARGETING SCOPE: %d unique location(s), %d job role(s)", total_locations, len(person_titles))
+        logger.info("🎚️ Strategy: Narrow location targeting (avoids broad areas for precise results)")
     
     return {'valid': True, 'error': None}
 
@@ -548,23 +841,8 @@ def extract_location_from_description(description: str) -> List[str]:
     
     Parses common location formats and returns location strings for Apollo search.
     """
-    # Basic implementation - extract common location patterns
-    import re
-    
-    locations = []
-    
-    # Simple patterns for cities, states, countries
-    location_patterns = [
-        r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s*[A-Z]{2}\b',  # City, State
-        r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s*[A-Z][a-z]+\b',  # City, Country
-        r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b'  # Two-word locations
-    ]
-    
-    for pattern in location_patterns:
-        matches = re.findall(pattern, description)
-        locations.extend(matches)
-    
-    return list(set(locations))  # Remove duplicates
+    # Basic implementation - extract common location patterns (deduplicated, first match order)
+    return list(dict.fromkeys(match for pattern in _LOCATION_PATTERNS for match in pattern.findall(description)))
 
 
 def determine_target_job_titles(project_details: str) -> List[str]:
@@ -3,6 +3,7 @@ Job Role Configuration Functions
 Manages job role settings for projects and global configuration
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any
 from firebase_functions import https_fn, options
 from firebase_admin import firestore
@@ -13,8 +14,14 @@ logger = get_logger(__file__)
 # Configure European region
 EUROPEAN_REGION = options.SupportedRegion.EUROPE_WEST1
 
-from config_model import JobRole, JobRoleConfig
-from config_sync import config_sync
+from config_model import JobRole, JobRoleConfig, parse_job_roles
+from config_sync import get_config_sync
+
+# Predefined job roles never change at runtime, so the option list is built once
+_AVAILABLE_JOB_ROLES = tuple({'value': role.value, 'label': role.value} for role in JobRole)
+
+# Loads the global config while the request thread loads the project config
+_io_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='job-roles-io')
 
 
 @https_fn.on_call(region=EUROPEAN_REGION)
@@ -31,11 +38,13 @@ def get_job_roles_config(req: https_fn.CallableRequest) -> Dict[str, Any]:
     """
     try:
         project_id = req.data.get('project_id')
+        config_sync = get_config_sync()
         
         if project_id:
-            # Get project-specific configuration
+            # Get project-specific configuration (both configs are read concurrently)
+            global_config_future = _io_executor.submit(config_sync.load_global_config_from_firebase)
             project_config = config_sync.load_project_config_from_firebase(project_id)
-            global_config = config_sync.load_global_config_from_firebase()
+            global_config = global_config_future.result()
             effective_config = project_config.get_effective_config(global_config)
             
             return {
@@ -88,31 +97,32 @@ def update_job_roles_config(req: https_fn.CallableRequest) -> Dict[str, Any]:
         target_roles = req.data.get('target_roles', [])
         custom_roles = req.data.get('custom_roles', [])
         use_global = req.data.get('use_global', True)
+        config_sync = get_config_sync()
         
-        # Validate target roles
-        valid_roles = []
-        for role_str in target_roles:
-            try:
-                role = JobRole(role_str)
-                valid_roles.append(role)
-            except ValueError:
+        # A project switched to the global roles keeps its own roles untouched,
+        # so the submitted roles are only validated when they will be stored
+        job_role_config = None
+        if not (project_id and use_global):
+            # Validate target roles
+            valid_roles, invalid_roles = parse_job_roles(target_roles)
+            for role_str in invalid_roles:
                 logger.warning(f"Invalid job role: {role_str}")
-        
-        # Create job role config
-        job_role_config = JobRoleConfig(
-            target_roles=valid_roles,
-            custom_roles=custom_roles
-        )
-        
-        if not job_role_config.validate():
-            raise ValueError("Invalid job role configuration - must have at least one role")
+            
+            # Create job role config
+            job_role_config = JobRoleConfig(
+                target_roles=valid_roles,
+                custom_roles=custom_roles
+            )
+            
+            if not job_role_config.validate():
+                raise ValueError("Invalid job role configuration - must have at least one role")
         
         if project_id:
             # Update project-specific configuration
             project_config = config_sync.load_project_config_from_firebase(project_id)
             project_config.use_global_job_roles = use_global
             
-            if not use_global:
+            if job_role_config is not None:
                 project_config.job_roles = job_role_config
             
             success = config_sync.sync_project_config_to_firebase(project_config)
@@ -148,14 +158,9 @@ def get_available_job_roles(req: https_fn.CallableRequest) -> Dict[str, Any]:
         Dict with available job roles
     """
     try:
-        predefined_roles = [
-            {'value': role.value, 'label': role.value}
-            for role in JobRole
-        ]
-        
         return {
             'success': True,
-            'roles': predefined_roles
+            'roles': list(_AVAILABLE_JOB_ROLES)
         }
         
     except Exception as e:
@@ -4,43 +4,28 @@ Handles parsing raw location input using LLM and converting to clean location st
 """
 
 import re
-import json
 from typing import List, Dict, Optional, Tuple, Any
-import requests
+import orjson
 from openai import OpenAI
 
 from config_model import LocationConfig
-from utils.firebase_utils import get_api_keys
+from utils.firebase_utils import get_api_keys, get_firestore_client, config_cache_enabled
+from utils.api_clients import OpenAIClient, get_cached_client
+from utils.cache_utils import FirestoreCache, make_cache_key
 
 # Configure logging for Firebase Functions
 from utils.logging_config import get_logger
 logger = get_logger(__file__)
 
+# Location extraction is a small structured task; a fast model with JSON mode is enough
+LOCATION_PARSING_MODEL = "gpt-4o-mini"
 
-class LocationProcessor:
-    """Processes location data for Apollo API searches using LLM to extract clean location strings"""
-    
-    def __init__(self, openai_client: Optional[OpenAI] = None):
-        self.openai_client = openai_client
-    
-    def parse_location_with_llm(self, raw_location: str) -> Tuple[List[str], Dict[str, Any]]:
-        """
-        Parse raw location string using LLM to extract clean location strings for Apollo API
-        
-        Args:
-            raw_location: Raw location string (e.g., "123 Main St, San Francisco Bay Area, California, Apt 4B")
-            
-        Returns:
-            Tuple of (clean_location_strings, parsed_info)
-        """
-        if not self.openai_client:
-            raise ValueError("OpenAI API key is required for location processing. Please configure the OpenAI API key in your settings.")
-        
-        try:
-            prompt = f"""
-You are a location extraction expert specializing in NARROW, SPECIFIC location targeting for Apollo.io lead searches.
+# Bump when the parsing prompt changes so cached parses from the old prompt are not reused
+LOCATION_PROMPT_VERSION = "2"
 
-User input: "{raw_location}"
+# Fixed instructions for location parsing, sent as the system message so every request
+# shares the same prefix; only the user's input varies
+_LOCATION_SYSTEM_PROMPT = """You are a location extraction expert specializing in NARROW, SPECIFIC location targeting for Apollo.io lead searches.
 
 CRITICAL: Apollo uses OR logic between locations. If you include both "Linz" and "Austria", it will search ALL of Austria, making "Linz" meaningless. Focus on the MOST SPECIFIC locations only.
 
@@ -70,16 +55,63 @@ RIGHT (consistent specificity): ["Brooklyn", "Brooklyn, NY", "Brooklyn, New York
 
 Return only valid JSON.
 """
+
+# LLM parses shared across projects and instances. A parse only depends on the input,
+# model and prompt, so the TTL just bounds the collection's size.
+_LOCATION_PARSE_CACHE = FirestoreCache('location_cache', ttl_seconds=30 * 24 * 3600)
+
+# Characters stripped from LLM location strings (anything but word characters, spaces, commas, hyphens, dots)
+_UNWANTED_LOCATION_CHARS = re.compile(r'[^\w\s,\-.]')
+
+# Location-like patterns for _extract_location_patterns, compiled once at import
+_LOCATION_PATTERNS = (
+    re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s*[A-Z]{2}\b'),  # City, State
+    re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s*[A-Z][a-z]+\b'),  # City, Country
+    re.compile(r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b'),  # Two-word locations
+    re.compile(r'\b[A-Z]{2}\b'),  # State abbreviations
+)
+
+
+class LocationProcessor:
+    """Processes location data for Apollo API searches using LLM to extract clean location strings"""
+    
+    def __init__(self, openai_client: Optional[OpenAI] = None):
+        self.openai_client = openai_client
+    
+    def parse_location_with_llm(self,
+                                raw_location: str,
+                                openai_client: Optional[OpenAI] = None) -> Tuple[List[str], Dict[str, Any]]:
+        """
+        Parse raw location string using LLM to extract clean location strings for Apollo API
+        
+        Args:
+            raw_location: Raw location string (e.g., "123 Main St, San Francisco Bay Area, California, Apt 4B")
+            openai_client: OpenAI client for this call (defaults to the processor's own client)
             
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1,
+        Returns:
+            Tuple of (clean_location_strings, parsed_info)
+        """
+        openai_client = openai_client or self.openai_client
+        if not openai_client:
+            raise ValueError("OpenAI API key is required for location processing. Please configure the OpenAI API key in your settings.")
+        
+        try:
+            response = openai_client.chat.completions.create(
+                model=LOCATION_PARSING_MODEL,
+                messages=[
+                    {"role": "system", "content": _LOCATION_SYSTEM_PROMPT},
+                    {"role": "user", "content": f'User input: "{raw_location}"'}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0,
                 max_tokens=500
             )
             
-            parsed_data = json.loads(response.choices[0].message.content)
+            parsed_data = orjson.loads(response.choices[0].message.content)
             clean_locations = parsed_data.get('clean_locations', [])
+            if not isinstance(clean_locations, list):
+                # JSON mode guarantees an object, not its shape - a bare string would be split into characters
+                clean_locations = []
             
             # Validate and clean the location strings
             validated_locations = self._validate_location_strings(clean_locations)
@@ -90,25 +122,49 @@ Return only valid JSON.
             logger.error(f"LLM location parsing failed: {e}")
             raise ValueError(f"Failed to process location '{raw_location}' with LLM: {str(e)}")
     
+    def parse_location_cached(self,
+                              raw_location: str,
+                              openai_client: Optional[OpenAI] = None,
+                              db=None) -> Tuple[List[str], Dict[str, Any]]:
+        """
+        Parse a raw location string like parse_location_with_llm, reusing earlier parses
+        
+        A hit needs no OpenAI client, so callers may pass None when no key is configured.
+        
+        Args:
+            raw_location: Raw location string
+            openai_client: OpenAI client used on a cache miss (defaults to the processor's own client)
+            db: Firestore client for the shared cache (defaults to the app's client)
+            
+        Returns:
+            Tuple of (clean_location_strings, parsed_info)
+        """
+        use_cache = config_cache_enabled()
+        if use_cache:
+            db = db or get_firestore_client()
+            cache_key = location_cache_key(raw_location)
+            cached = _LOCATION_PARSE_CACHE.get(db, cache_key)
+            if cached and cached.get('clean_locations'):
+                logger.info(f"Reusing cached location parse for '{raw_location}'")
+                return list(cached['clean_locations']), dict(cached.get('parsed_info') or {})
+        
+        clean_locations, parsed_info = self.parse_location_with_llm(raw_location, openai_client)
+        
+        if clean_locations and use_cache:
+            _LOCATION_PARSE_CACHE.set(db, cache_key, {
+                'clean_locations': list(clean_locations),
+                'parsed_info': dict(parsed_info)
+            })
+        
+        return clean_locations, parsed_info
+    
     # Note: _simple_location_parse method removed - LLM processing is now mandatory
     
     def _extract_location_patterns(self, text: str) -> List[str]:
         """
         Extract location-like patterns from text using regex
         """
-        patterns = [
-            r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s*[A-Z]{2}\b',  # City, State
-            r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s*[A-Z][a-z]+\b',  # City, Country
-            r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b',  # Two-word locations
-            r'\b[A-Z]{2}\b',  # State abbreviations
-        ]
-        
-        extracted = []
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
-            extracted.extend(matches)
-        
-        return list(set(extracted))
+        return list(dict.fromkeys(match for pattern in _LOCATION_PATTERNS for match in pattern.findall(text)))
     
     def _validate_location_strings(self, location_strings: List[str]) -> List[str]:
         """
@@ -120,7 +176,8 @@ Return only valid JSON.
         Returns:
             List of validated location strings
         """
-        validated = []
+        # Keyed by lowercased location so duplicates are dropped in the same pass (first spelling wins)
+        validated = {}
         
         for location in location_strings:
             if isinstance(location, str):
@@ -130,21 +187,11 @@ Return only valid JSON.
                 # Basic validation - must be at least 2 characters and contain letters
                 if len(cleaned) >= 2 and any(c.isalpha() for c in cleaned):
                     # Remove any remaining unwanted characters but keep spaces, commas, hyphens
-                    import re
-                    cleaned = re.sub(r'[^\w\s,\-.]', '', cleaned)
+                    cleaned = _UNWANTED_LOCATION_CHARS.sub('', cleaned)
                     if cleaned:
-                        validated.append(cleaned)
-        
-        # Remove duplicates while preserving order
-        seen = set()
-        result = []
-        for location in validated:
-            location_lower = location.lower()
-            if location_lower not in seen:
-                seen.add(location_lower)
-                result.append(location)
-        
-        return result
+                        validated.setdefault(cleaned.lower(), cleaned)
+        
+        return list(validated.values())
     
     def get_apollo_location_params(self, location_config: LocationConfig) -> Dict[str, Any]:
         """
@@ -163,7 +210,7 @@ Return only valid JSON.
         if not api_keys.get('openai'):
             raise ValueError("OpenAI API key is required for location processing. Please configure the OpenAI API key in your settings.")
         
-        self.openai_client = OpenAI(api_key=api_keys['openai'])
+        openai_client = get_cached_client(OpenAIClient, api_keys['openai']).client
         
         # Use raw_location if available, otherwise try configured location data
         location_input = location_config.raw_location
@@ -175,7 +222,7 @@ Return only valid JSON.
         
         try:
             # Use LLM to parse location into clean strings
-            clean_locations, parsed_info = self.parse_location_with_llm(location_input)
+            clean_locations, parsed_info = self.parse_location_cached(location_input, openai_client)
             
             if clean_locations:
                 # Use clean location strings for Apollo API
@@ -204,5 +251,18 @@ Return only valid JSON.
     # Location suggestions can now be implemented using LLM if needed
 
 
+def location_cache_key(raw_location: str) -> str:
+    """
+    Cache key for an LLM location parse
+    
+    Args:
+        raw_location: Raw location string (case and runs of whitespace are ignored)
+        
+    Returns:
+        Key covering the normalized input, parsing model and prompt version
+    """
+    return make_cache_key(' '.join(raw_location.split()), LOCATION_PARSING_MODEL, LOCATION_PROMPT_VERSION)
+
+
 # Global instance
 location_processor = LocationProcessor() 
\ No newline at end of file
@@ -4,12 +4,27 @@
 
 from firebase_functions import https_fn, firestore_fn, options
 from firebase_admin import initialize_app, firestore
+from google.cloud.firestore_v1.bulk_writer import BulkRetry, BulkWriterOptions
 from datetime import datetime, timedelta
+from cachetools import TTLCache
 import logging
+import threading
 
 # Configure European region
 EUROPEAN_REGION = options.SupportedRegion.EUROPE_WEST1
 
+# Attempts per follow-up update before BulkWriter gives up on it (backing off exponentially)
+FOLLOWUP_WRITE_MAX_ATTEMPTS = 5
+FOLLOWUP_WRITER_OPTIONS = BulkWriterOptions(retry=BulkRetry.exponential)
+
+# Lead fields read when checking follow-up eligibility
+FOLLOWUP_LEAD_FIELDS = ['email', 'followupCount', 'lastContacted']
+
+# settings/global, briefly reused across follow-up calls. The web app writes it
+# directly, so keep the TTL short enough that an edit is picked up quickly.
+_GLOBAL_SETTINGS_CACHE = TTLCache(maxsize=1, ttl=60)
+_global_settings_lock = threading.Lock()
+
 # Configure logging for Firebase Functions
 from utils.logging_config import get_logger
 logger = get_logger(__file__)
@@ -17,12 +32,13 @@ logger = get_logger(__file__)
 # Import new functions
 from find_leads import find_leads
 from contact_leads import contact_leads
-from enrich_leads import enrich_leads, get_enrichment_status
+from enrich_leads import enrich_leads, enrich_leads_task, get_enrichment_status
 from email_generation import generate_emails, preview_email
 from config_management import get_global_config, update_global_config, get_project_config, update_project_config
 from test_apis import test_apis, validate_api_keys, get_api_status
 from job_role_config import get_job_roles_config, update_job_roles_config, get_available_job_roles
 from database_functions import database_cleanup, database_initialize, database_health_check, database_full_maintenance
+from utils import config_cache_enabled
 
 # Initialize Firebase Admin
 initialize_app()
@@ -32,6 +48,7 @@ __all__ = [
     'find_leads', 
     'contact_leads', 
     'enrich_leads',
+    'enrich_leads_task',
     'get_enrichment_status',
     'generate_emails',
     'preview_email',
@@ -55,6 +72,33 @@ __all__ = [
     'health_check'
 ]
 
+def _get_global_settings(db) -> dict:
+    """
+    Get the settings/global document, reusing a recent read from this instance
+    
+    Read errors are not caught, so callers fail instead of falling back to defaults.
+    
+    Args:
+        db: Firestore client
+        
+    Returns:
+        Copy of the global settings (empty if the document does not exist)
+    """
+    use_cache = config_cache_enabled()
+    settings_data = None
+    if use_cache:
+        with _global_settings_lock:
+            settings_data = _GLOBAL_SETTINGS_CACHE.get('global')
+    
+    if settings_data is None:
+        settings_doc = db.collection('settings').document('global').get()
+        settings_data = settings_doc.to_dict() if settings_doc.exists else {}
+        if use_cache:
+            with _global_settings_lock:
+                _GLOBAL_SETTINGS_CACHE['global'] = settings_data
+    
+    return dict(settings_data)
+
 @https_fn.on_call(region=EUROPEAN_REGION)
 def trigger_followup(req: https_fn.CallableRequest) -> dict:
     """
@@ -85,12 +129,7 @@ def trigger_followup(req: https_fn.CallableRequest) -> dict:
             raise ValueError("Lead has already responded")
         
         # Get global settings
-        settings_ref = db.collection('settings').document('global')
-        settings_doc = settings_ref.get()
-        max_followups = 3  # default
-        
-        if settings_doc.exists:
-            max_followups = settings_doc.to_dict().get('maxFollowups', 3)
+        max_followups = _get_global_settings(db).get('maxFollowups', 3)
         
         current_followups = lead_data.get('followupCount', 0)
         
@@ -130,25 +169,38 @@ def process_all_followups(req: https_fn.CallableRequest) -> dict:
         db = firestore.client()
         
         # Get global settings
-        settings_ref = db.collection('settings').document('global')
-        settings_doc = settings_ref.get()
-        
-        followup_delay_days = 7  # default
-        max_followups = 3  # default
-        
-        if settings_doc.exists:
-            settings_data = settings_doc.to_dict()
-            followup_delay_days = settings_data.get('followupDelayDays', 7)
-            max_followups = settings_data.get('maxFollowups', 3)
+        settings_data = _get_global_settings(db)
+        followup_delay_days = settings_data.get('followupDelayDays', 7)
+        max_followups = settings_data.get('maxFollowups', 3)
         
         # Calculate cutoff date
         cutoff_date = datetime.now() - timedelta(days=followup_delay_days)
         
+        # Load the blacklist once for the whole run
+        blacklist_doc = db.collection('blacklist').document('emails').get()
+        blacklisted_emails = frozenset()
+        if blacklist_doc.exists:
+            blacklisted_emails = frozenset(
+                entry.strip().lower() for entry in blacklist_doc.to_dict().get('list', []) if entry
+            )
+        
         # Get leads eligible for follow-up
         leads_ref = db.collection('leads')
-        leads_query = leads_ref.where('status', 'in', ['emailed', 'new']).stream()
+        leads_query = leads_ref.where('status', 'in', ['emailed', 'new']).select(FOLLOWUP_LEAD_FIELDS).stream()
         
-        processed_count = 0
+        # Updates are pipelined through a BulkWriter instead of one blocking RPC per lead
+        processed_leads = []
+        failed_lead_ids = set()
+        
+        def _on_write_error(error, bulk_writer) -> bool:
+            if error.attempts < FOLLOWUP_WRITE_MAX_ATTEMPTS:
+                return True
+            failed_lead_ids.add(error.operation.reference.id)
+            logger.error(f"Failed to update lead {error.operation.reference.id}: {error.message}")
+            return False
+        
+        bulk_writer = db.bulk_writer(options=FOLLOWUP_WRITER_OPTIONS)
+        bulk_writer.on_write_error(_on_write_error)
         
         for lead_doc in leads_query:
             lead_data = lead_doc.to_dict()
@@ -165,27 +217,28 @@ def process_all_followups(req: https_fn.CallableRequest) -> dict:
                 continue
             
             # Check blacklist
-            email = lead_data.get('email', '').lower()
-            blacklist_ref = db.collection('blacklist').document('emails')
-            blacklist_doc = blacklist_ref.get()
-            
-            if blacklist_doc.exists:
-                blacklist_data = blacklist_doc.to_dict()
-                blacklisted_emails = blacklist_data.get('list', [])
-                if email in blacklisted_emails:
-                    # Update lead status to blacklisted
-                    lead_doc.reference.update({'status': 'blacklisted'})
-                    continue
+            email = (lead_data.get('email') or '').lower()
+            if email in blacklisted_emails:
+                # Update lead status to blacklisted
+                bulk_writer.update(lead_doc.reference, {'status': 'blacklisted'})
+                continue
             
             # Process follow-up
-            lead_doc.reference.update({
+            bulk_writer.update(lead_doc.reference, {
                 'status': 'emailed',
                 'lastContacted': datetime.now(),
                 'followupCount': current_followups + 1
             })
-            
-            processed_count += 1
-            logger.info(f"Follow-up processed for lead {lead_id} ({email})")
+            processed_leads.append((lead_id, email))
+        
+        # Wait for every queued update (including retries) to finish
+        bulk_writer.close()
+        
+        processed_count = 0
+        for lead_id, email in processed_leads:
+            if lead_id not in failed_lead_ids:
+                processed_count += 1
+                logger.info(f"Follow-up processed for lead {lead_id} ({email})")
         
         return {
             'success': True,
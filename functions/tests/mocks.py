@@ -55,6 +55,12 @@ class MockApolloClient:
             }
         }
     
+    def search_people_pages(self, max_results: int, **kwargs) -> Dict[str, Any]:
+        """Mock multi-page Apollo people search (single mock page)"""
+        result = self.search_people(**kwargs)
+        result['people'] = result['people'][:max_results]
+        return result
+    
     def get_person_details(self, person_id: str) -> Dict[str, Any]:
         """Mock getting person details"""
         return {
@@ -84,17 +90,37 @@ class MockApolloClient:
         }
 
 
+class MockAsyncSession:
+    """Mock async HTTP session usable as an async context manager"""
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
 class MockPerplexityClient:
     """Mock implementation of Perplexity API client"""
     
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.base_url = "https://api.perplexity.ai"
+    
+    @staticmethod
+    def create_session() -> MockAsyncSession:
+        """Mock session factory"""
+        return MockAsyncSession()
+    
+    async def aenrich_lead_data(self, session: Any, concurrency_limiter: Any = None, **kwargs) -> Dict[str, Any]:
+        """Mock async lead enrichment - delegates to enrich_lead_data"""
+        return self.enrich_lead_data(**kwargs)
         
     def enrich_lead_data(self, 
                         company_name: str,
                         person_name: str = None,
-                        additional_context: str = None) -> Dict[str, Any]:
+                        additional_context: str = None,
+                        timeout: float = None) -> Dict[str, Any]:
         """Mock lead enrichment"""
         
         # Generate different responses based on input
@@ -229,6 +255,10 @@ class MockFirestoreClient:
     def batch(self):
         """Mock batch operations"""
         return MockBatch()
+    
+    def bulk_writer(self, options=None):
+        """Mock bulk writer"""
+        return MockBulkWriter()
 
 
 class MockCollection:
@@ -303,6 +333,10 @@ class MockQuery:
         self.operator = operator
         self.value = value
         
+    def select(self, field_paths: List[str]):
+        """Mock field projection (returns full documents)"""
+        return self
+    
     def stream(self):
         """Mock query streaming"""
         for doc_id, data in self.collection.documents.items():
@@ -345,6 +379,32 @@ class MockBatch:
                 doc_ref.update(data)
 
 
+class MockBulkWriter:
+    """Mock Firestore bulk writer (writes are applied immediately)"""
+    
+    def on_write_error(self, callback):
+        """Mock error callback registration"""
+        self.error_callback = callback
+    
+    def create(self, doc_ref: MockDocument, data: Dict[str, Any]):
+        """Mock bulk create"""
+        doc_ref.set(data)
+    
+    def set(self, doc_ref: MockDocument, data: Dict[str, Any], merge: bool = False):
+        """Mock bulk set"""
+        doc_ref.set(data)
+    
+    def update(self, doc_ref: MockDocument, updates: Dict[str, Any]):
+        """Mock bulk update"""
+        doc_ref.update(updates)
+    
+    def flush(self):
+        """Mock flush"""
+    
+    def close(self):
+        """Mock close"""
+
+
 class MockFirebaseApp:
     """Mock Firebase app"""
     
@@ -388,6 +448,28 @@ class MockLeadProcessor:
                 
         return unique_leads
     
+    def apply_lead_filters(self, leads: List[Dict[str, Any]], filter_config: Any,
+                           existing_leads: List[Dict[str, Any]] = None,
+                           blacklisted_emails: Any = None,
+                           drop_duplicates: bool = False) -> Any:
+        """Mock lead filtering - only drops blacklisted and (optionally) duplicate leads"""
+        blacklisted = {email.lower() for email in blacklisted_emails or []}
+        filtered = [lead for lead in leads if (lead.get('email') or '').lower() not in blacklisted]
+        
+        if drop_duplicates:
+            unique_leads = self.check_duplicate_leads(filtered, existing_leads or [])
+            return unique_leads, len(filtered) - len(unique_leads)
+        
+        return filtered
+    
+    def get_filtering_stats(self, original_count: int, filtered_count: int, filter_config: Any) -> Dict[str, Any]:
+        """Mock filtering statistics"""
+        return {
+            'original_count': original_count,
+            'filtered_count': filtered_count,
+            'filtered_out': original_count - filtered_count
+        }
+    
     def prepare_lead_for_database(self, lead: Dict[str, Any], project_id: str) -> Dict[str, Any]:
         """Mock preparing lead for database"""
         return {
@@ -238,6 +238,113 @@ class TestEnrichLeads(FirebaseFunctionsTestCase):
         self.assertEqual(result['leads_enriched'], 0)
         self.assertGreaterEqual(result['leads_failed'], 0)
 
+    
+    def test_enrich_leads_concurrent_enrichment(self):
+        """Test that every streamed lead is enriched through the concurrent path"""
+        mock_firestore = self._setup_enrich_leads_mocks()
+        
+        mock_leads = [
+            {'name': f'Test User {i}', 'email': f'user{i}@example.com',
+             'company': f'Test Company {i}', 'projectId': 'test_project_123'}
+            for i in range(3)
+        ]
+        mock_leads_collection = mock_firestore.collection('leads')
+        mock_query = Mock()
+        mock_query.stream.return_value = [
+            Mock(id=f'lead_{i}', to_dict=(lambda data=data: dict(data)))
+            for i, data in enumerate(mock_leads)
+        ]
+        mock_query.where.return_value = mock_query
+        mock_leads_collection.where.return_value = mock_query
+        
+        request_data = {
+            'project_id': 'test_project_123',
+            'enrichment_type': 'both'
+        }
+        
+        with patch('enrich_leads.get_firestore_client', return_value=mock_firestore), \
+             patch('enrich_leads.get_api_keys', return_value=self.test_api_keys), \
+             patch('enrich_leads.PerplexityClient', return_value=self.mock_perplexity_client), \
+             patch('enrich_leads.LeadProcessor', return_value=self.mock_lead_processor):
+            
+            result = enrich_leads_logic(request_data)
+        
+        self.assert_successful_response(result)
+        self.assertEqual(result['leads_processed'], 3)
+        self.assertEqual(result['leads_enriched'], 3)
+        self.assertEqual(result['leads_failed'], 0)
+    
+    def test_enrich_leads_shares_identical_requests(self):
+        """Test that leads producing the same Perplexity request share one API call"""
+        mock_firestore = self._setup_enrich_leads_mocks()
+        
+        duplicate_lead = {'name': 'Shared User', 'email': 'shared@sharedco.example',
+                          'company': 'Shared Request Co', 'projectId': 'test_project_123'}
+        mock_leads_collection = mock_firestore.collection('leads')
+        mock_query = Mock()
+        mock_query.stream.return_value = [
+            Mock(id=f'lead_{i}', to_dict=(lambda: dict(duplicate_lead)))
+            for i in range(2)
+        ]
+        mock_query.where.return_value = mock_query
+        mock_leads_collection.where.return_value = mock_query
+        
+        request_data = {
+            'project_id': 'test_project_123',
+            'enrichment_type': 'both',
+            'force_re_enrich': True
+        }
+        
+        with patch('enrich_leads.get_firestore_client', return_value=mock_firestore), \
+             patch('enrich_leads.get_api_keys', return_value=self.test_api_keys), \
+             patch('enrich_leads.PerplexityClient', return_value=self.mock_perplexity_client), \
+             patch('enrich_leads.LeadProcessor', return_value=self.mock_lead_processor), \
+             patch.object(self.mock_perplexity_client, 'enrich_lead_data',
+                          wraps=self.mock_perplexity_client.enrich_lead_data) as mock_enrich:
+            
+            result = enrich_leads_logic(request_data)
+        
+        self.assert_successful_response(result)
+        self.assertEqual(result['leads_enriched'], 2)
+        self.assertEqual(mock_enrich.call_count, 1)
+    
+    def test_enrich_leads_retries_after_failed_validation(self):
+        """Test that a response failing validation is not reused by the next attempt"""
+        mock_firestore = self._setup_enrich_leads_mocks()
+        
+        lead = {'name': 'Retry User', 'email': 'retry@retryco.example',
+                'company': 'Retry Validation Co', 'projectId': 'test_project_123'}
+        mock_leads_collection = mock_firestore.collection('leads')
+        mock_query = Mock()
+        mock_query.stream.return_value = [Mock(id='lead_0', to_dict=(lambda: dict(lead)))]
+        mock_query.where.return_value = mock_query
+        mock_leads_collection.where.return_value = mock_query
+        
+        good_response = self.mock_perplexity_client.enrich_lead_data(
+            company_name=lead['company'], person_name=lead['name']
+        )
+        bad_response = {'choices': [{'message': {'content': 'No information available.'}}]}
+        
+        request_data = {
+            'project_id': 'test_project_123',
+            'enrichment_type': 'both',
+            'force_re_enrich': True
+        }
+        
+        with patch('enrich_leads.get_firestore_client', return_value=mock_firestore), \
+             patch('enrich_leads.get_api_keys', return_value=self.test_api_keys), \
+             patch('enrich_leads.PerplexityClient', return_value=self.mock_perplexity_client), \
+             patch('enrich_leads.LeadProcessor', return_value=self.mock_lead_processor), \
+             patch.object(self.mock_perplexity_client, 'enrich_lead_data',
+                          side_effect=[bad_response, good_response]) as mock_enrich:
+            
+            result = enrich_leads_logic(request_data)
+        
+        self.assert_successful_response(result)
+        self.assertEqual(result['leads_enriched'], 1)
+        self.assertEqual(result['leads_failed'], 0)
+        self.assertEqual(mock_enrich.call_count, 2)
+
 
 class TestGetEnrichmentStatus(FirebaseFunctionsTestCase):
     """Test cases for get_enrichment_status function"""
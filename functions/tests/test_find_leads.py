@@ -9,18 +9,31 @@ import unittest
 from unittest.mock import patch, MagicMock, Mock
 import sys
 import os
+from datetime import datetime, timezone
+from firebase_admin import firestore
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from tests.base_test import FirebaseFunctionsTestCase
 from tests.mocks import MockFirestoreClient, MockApolloClient
+import find_leads as find_leads_module
+import location_processor as location_processor_module
+from location_processor import LocationProcessor
 from find_leads import find_leads, find_leads_logic
+from utils.data_processing import LeadProcessor
 
 
 class TestFindLeads(FirebaseFunctionsTestCase):
     """Test cases for find_leads function"""
     
+    def setUp(self):
+        super().setUp()
+        # Each test mocks its own project document
+        find_leads_module._PROJECT_CACHE.clear()
+        find_leads_module._BLACKLIST_CACHE.clear()
+        location_processor_module._LOCATION_PARSE_CACHE._memory.clear()
+    
     def _setup_find_leads_mocks(self):
         """Helper method to set up mocking for find_leads tests"""
         # Create pure Mock objects for this test
@@ -29,6 +42,12 @@ class TestFindLeads(FirebaseFunctionsTestCase):
         mock_project_doc.exists = True
         mock_project_doc.to_dict.return_value = self.test_project_data
         
+        # Store the area's parse on the project so no test reaches the OpenAI API
+        area_description = self.test_project_data.get('areaDescription')
+        if area_description:
+            self.test_project_data['parsedLocations'] = [area_description]
+            self.test_project_data['locationsHash'] = location_processor_module.location_cache_key(area_description)
+        
         # Mock the projects collection
         mock_projects_collection = Mock()
         mock_project_document = Mock()
@@ -39,6 +58,7 @@ class TestFindLeads(FirebaseFunctionsTestCase):
         mock_leads_collection = Mock()
         mock_query = Mock()
         mock_query.stream.return_value = []  # No existing leads for this test
+        mock_query.select.return_value = mock_query
         mock_leads_collection.where.return_value = mock_query
         
         # Mock the document references for saving new leads
@@ -57,9 +77,9 @@ class TestFindLeads(FirebaseFunctionsTestCase):
         
         mock_firestore.collection.side_effect = collection_side_effect
         
-        # Mock batch operations
-        mock_batch = Mock()
-        mock_firestore.batch.return_value = mock_batch
+        # Mock bulk writer operations
+        mock_bulk_writer = Mock()
+        mock_firestore.bulk_writer.return_value = mock_bulk_writer
         
         return mock_firestore
     
@@ -356,9 +376,108 @@ class TestFindLeads(FirebaseFunctionsTestCase):
             result = find_leads_logic(request_data)
         
         self.assert_successful_response(result)
+        self.assertGreater(result['leads_added'], 0)
+        
+        # Every saved lead is queued as a create on the BulkWriter, which is flushed once
+        mock_bulk_writer = mock_firestore.bulk_writer.return_value
+        self.assertEqual(mock_bulk_writer.create.call_count, result['leads_added'])
+        mock_bulk_writer.close.assert_called_once()
+        
+        # The project lead count is incremented atomically by the number of saved leads
+        project_ref = mock_firestore.collection('projects').document.return_value
+        lead_count_updates = [
+            call.args[0]['leadCount'] for call in project_ref.update.call_args_list
+            if 'leadCount' in call.args[0]
+        ]
+        self.assertEqual(len(lead_count_updates), 1)
+        self.assertIsInstance(lead_count_updates[0], firestore.Increment)
+        self.assertEqual(lead_count_updates[0].value, result['leads_added'])
+    
+    def test_find_leads_already_exists_on_retry_counts_as_saved(self):
+        """Test that ALREADY_EXISTS only counts as saved when an earlier attempt may have landed"""
+        from google.cloud.firestore_v1.bulk_writer import BulkWriteFailure, BulkWriterCreateOperation
+        
+        mock_firestore = self._setup_find_leads_mocks()
+        mock_leads_collection = mock_firestore.collection('leads')
+        lead_refs = [Mock(id=f'lead_{i}') for i in range(3)]
+        mock_leads_collection.document.side_effect = lead_refs
+        
+        mock_bulk_writer = mock_firestore.bulk_writer.return_value
+        callback_results = {}
+        
+        def failure(ref, code, attempts):
+            operation = BulkWriterCreateOperation(reference=ref, document_data={}, attempts=attempts)
+            return BulkWriteFailure(operation=operation, code=code, message='failed')
+        
+        def close_side_effect():
+            on_write_error = mock_bulk_writer.on_write_error.call_args.args[0]
+            # lead_0: the first attempt timed out after landing, the retry finds the document
+            callback_results['transient'] = on_write_error(
+                failure(lead_refs[0], find_leads_module.code_pb2.UNAVAILABLE, 0), mock_bulk_writer)
+            callback_results['landed_retry'] = on_write_error(
+                failure(lead_refs[0], find_leads_module.ALREADY_EXISTS, 1), mock_bulk_writer)
+            # lead_1: the document already existed, so every attempt conflicts
+            callback_results['conflict'] = [
+                on_write_error(failure(lead_refs[1], find_leads_module.ALREADY_EXISTS, attempts), mock_bulk_writer)
+                for attempts in range(find_leads_module.BULK_WRITE_MAX_ATTEMPTS + 1)
+            ]
+        
+        mock_bulk_writer.close.side_effect = close_side_effect
+        
+        request_data = {
+            'project_id': 'test_project_123',
+            'num_leads': 3,
+            'auto_enrich': False
+        }
+        
+        with patch('find_leads.get_firestore_client', return_value=mock_firestore), \
+             patch('find_leads.get_api_keys', return_value=self.test_api_keys), \
+             patch('find_leads.ApolloClient', return_value=self.mock_apollo_client), \
+             patch('find_leads.LeadProcessor', return_value=self.mock_lead_processor):
+            
+            result = find_leads_logic(request_data)
+        
+        self.assert_successful_response(result)
+        self.assertEqual(mock_bulk_writer.create.call_count, 3)
+        self.assertTrue(callback_results['transient'])
+        self.assertFalse(callback_results['landed_retry'])
+        self.assertEqual(callback_results['conflict'],
+                         [True] * find_leads_module.BULK_WRITE_MAX_ATTEMPTS + [False])
+        
+        # lead_0 and lead_2 are saved, lead_1 failed
+        self.assertEqual(result['leads_added'], 2)
+        project_ref = mock_firestore.collection('projects').document.return_value
+        lead_count_updates = [
+            call.args[0]['leadCount'] for call in project_ref.update.call_args_list
+            if 'leadCount' in call.args[0]
+        ]
+        self.assertEqual([update.value for update in lead_count_updates], [2])
+    
+    def test_find_leads_queues_enrichment_for_saved_leads(self):
+        """Test that auto enrichment is queued as a task for the saved leads"""
+        mock_firestore = self._setup_find_leads_mocks()
         
-        # The mock should have been called to update the project
-        # In a real implementation, we'd verify the project update calls
+        request_data = {
+            'project_id': 'test_project_123',
+            'num_leads': 3,
+            'auto_enrich': True
+        }
+        
+        with patch('find_leads.get_firestore_client', return_value=mock_firestore), \
+             patch('find_leads.get_api_keys', return_value=self.test_api_keys), \
+             patch('find_leads.ApolloClient', return_value=self.mock_apollo_client), \
+             patch('find_leads.LeadProcessor', return_value=self.mock_lead_processor), \
+             patch('find_leads._enqueue_enrichment') as mock_enqueue:
+            
+            result = find_leads_logic(request_data)
+        
+        self.assert_successful_response(result)
+        self.assertTrue(result['enrichment_triggered'])
+        mock_enqueue.assert_called_once()
+        enrichment_data = mock_enqueue.call_args.args[0]
+        self.assertEqual(enrichment_data['project_id'], 'test_project_123')
+        self.assertEqual(enrichment_data['enrichment_type'], 'both')
+        self.assertEqual(len(enrichment_data['lead_ids']), result['leads_added'])
 
 
 class TestFindLeadsHelperFunctions(unittest.TestCase):
@@ -408,6 +527,163 @@ class TestFindLeadsHelperFunctions(unittest.TestCase):
             
         except ImportError:
             self.skipTest("extract_company_criteria function not implemented")
+    
+    def test_get_project_is_cached(self):
+        """Test that a project document is read once and copies are returned"""
+        find_leads_module._PROJECT_CACHE.clear()
+        project_ref = Mock()
+        project_ref.id = 'cached_project'
+        project_ref.get.return_value.exists = True
+        project_ref.get.return_value.to_dict.return_value = {'name': 'Cached'}
+        
+        first = find_leads_module._get_project(project_ref)
+        first['name'] = 'Changed'
+        second = find_leads_module._get_project(project_ref)
+        
+        self.assertEqual(second, {'name': 'Cached'})
+        project_ref.get.assert_called_once()
+    
+    def test_get_project_not_found(self):
+        """Test that missing projects are not cached"""
+        find_leads_module._PROJECT_CACHE.clear()
+        project_ref = Mock()
+        project_ref.id = 'missing_project'
+        project_ref.get.return_value.exists = False
+        
+        self.assertIsNone(find_leads_module._get_project(project_ref))
+        self.assertIsNone(find_leads_module._get_project(project_ref))
+        self.assertEqual(project_ref.get.call_count, 2)
+    
+    @patch.dict(os.environ, {'KIM_DISABLE_CONFIG_CACHE': 'true'})
+    def test_get_project_bypasses_cache_when_disabled(self):
+        """Test that the config cache kill switch forces a fresh read"""
+        find_leads_module._PROJECT_CACHE.clear()
+        project_ref = Mock()
+        project_ref.id = 'uncached_project'
+        project_ref.get.return_value.exists = True
+        project_ref.get.return_value.to_dict.return_value = {'name': 'Fresh'}
+        
+        find_leads_module._get_project(project_ref)
+        find_leads_module._get_project(project_ref)
+        
+        self.assertEqual(project_ref.get.call_count, 2)
+        self.assertNotIn('uncached_project', find_leads_module._PROJECT_CACHE)
+    
+    def test_location_parse_is_cached_and_persisted(self):
+        """Test that an areaDescription is parsed once and stored on the project"""
+        processor = LocationProcessor()
+        project_ref = Mock()
+        project_data = {'areaDescription': 'Linz'}
+        
+        with patch.object(processor, 'parse_location_with_llm',
+                          return_value=(['Linz', 'Linz, Austria'], {'method': 'llm'})) as mock_parse, \
+             patch('find_leads.get_cached_client'):
+            first = find_leads_module._parse_area_description('Linz', processor, {'openai': 'key'}, project_data, project_ref, Mock())
+            second = find_leads_module._parse_area_description('Linz', processor, {'openai': 'key'}, project_data, project_ref, Mock())
+            
+            self.assertEqual(first[0], ['Linz', 'Linz, Austria'])
+            self.assertEqual(second[0], first[0])
+            mock_parse.assert_called_once()
+            stored = project_ref.update.call_args[0][0]
+            self.assertEqual(stored['parsedLocations'], ['Linz', 'Linz, Austria'])
+            
+            # A project that already carries the parse needs neither OpenAI nor a key
+            location_processor_module._LOCATION_PARSE_CACHE._memory.clear()
+            stored_locations, _ = find_leads_module._parse_area_description('Linz', processor, {}, stored, None, Mock())
+            self.assertEqual(stored_locations, ['Linz', 'Linz, Austria'])
+            mock_parse.assert_called_once()
+            
+            # Another instance finds the parse in the shared Firestore cache
+            mock_db = Mock()
+            cache_doc = mock_db.collection.return_value.document.return_value.get.return_value
+            cache_doc.exists = True
+            cache_doc.to_dict.return_value = {
+                'value': {'clean_locations': ['Linz'], 'parsed_info': {'method': 'llm'}},
+                'cached_at': datetime.now(timezone.utc)
+            }
+            shared_locations, _ = find_leads_module._parse_area_description('  LINZ ', processor, {}, {}, None, mock_db)
+            self.assertEqual(shared_locations, ['Linz'])
+            mock_db.collection.assert_called_with('location_cache')
+            mock_parse.assert_called_once()
+    
+    def test_stored_location_parse_updates_cached_project(self):
+        """Test that a freshly stored parse is written into the cached project, so it is stored only once"""
+        processor = LocationProcessor()
+        project_ref = Mock(id='cached_project')
+        project_ref.get.return_value = Mock(exists=True, to_dict=Mock(return_value={'areaDescription': 'Graz'}))
+        find_leads_module._PROJECT_CACHE.clear()
+        location_processor_module._LOCATION_PARSE_CACHE._memory.clear()
+        
+        with patch.object(processor, 'parse_location_with_llm',
+                          return_value=(['Graz', 'Graz, Austria'], {'method': 'llm'})) as mock_parse, \
+             patch('find_leads.get_cached_client'), \
+             patch('find_leads.config_cache_enabled', return_value=True):
+            for _ in range(2):
+                project_data = find_leads_module._get_project(project_ref)
+                locations, _ = find_leads_module._parse_area_description(
+                    'Graz', processor, {'openai': 'key'}, project_data, project_ref, Mock()
+                )
+                self.assertEqual(locations, ['Graz', 'Graz, Austria'])
+        
+        mock_parse.assert_called_once()
+        project_ref.get.assert_called_once()
+        project_ref.update.assert_called_once()
+        cached_project = find_leads_module._PROJECT_CACHE['cached_project']
+        self.assertEqual(cached_project['parsedLocations'], ['Graz', 'Graz, Austria'])
+        self.assertEqual(cached_project['locationsHash'], location_processor_module.location_cache_key('Graz'))
+        find_leads_module._PROJECT_CACHE.clear()
+    
+    def test_load_matching_leads_batches_in_queries(self):
+        """Test that existing leads are looked up in batches of the 'in' query limit"""
+        mock_db = Mock()
+        project_leads = mock_db.collection.return_value.where.return_value
+        
+        def where_side_effect(field, operator, values):
+            query = Mock()
+            query.select.return_value.stream.return_value = [
+                Mock(to_dict=Mock(return_value={field: value})) for value in values if value.startswith('dup')
+            ]
+            return query
+        
+        project_leads.where.side_effect = where_side_effect
+        leads = [{'email': f'person{i}@example.com'} for i in range(35)]
+        leads.append({'email': 'dup@example.com', 'linkedin_url': 'dup-profile'})
+        
+        result = find_leads_module._load_matching_leads(mock_db, 'project_1', leads)
+        
+        # 36 emails in two batches and one LinkedIn batch, for both the normalized and the raw fields
+        self.assertEqual(project_leads.where.call_count, 6)
+        self.assertCountEqual(result, [
+            {'emailNormalized': 'dup@example.com'}, {'linkedinUrlNormalized': 'dup-profile'},
+            {'email': 'dup@example.com'}, {'linkedinUrl': 'dup-profile'}
+        ])
+    
+    def test_load_matching_leads_finds_mixed_case_email(self):
+        """Test that a stored lead differing only in email case is found and flagged as a duplicate"""
+        mock_db = Mock()
+        project_leads = mock_db.collection.return_value.where.return_value
+        processor = LeadProcessor()
+        stored_lead = processor.prepare_lead_for_database(
+            {'email': 'Jane.Doe@Example.com', 'company': 'Example GmbH',
+             'linkedin_url': 'https://www.linkedin.com/in/jane-doe/'},
+            'project_1'
+        )
+        
+        def where_side_effect(field, operator, values):
+            query = Mock()
+            query.select.return_value.stream.return_value = [
+                Mock(to_dict=Mock(return_value=stored_lead))
+            ] if stored_lead.get(field) in values else []
+            return query
+        
+        project_leads.where.side_effect = where_side_effect
+        new_lead = {'email': 'jane.doe@example.com', 'company': 'Example GmbH',
+                    'linkedin_url': 'http://linkedin.com/in/jane-doe'}
+        
+        existing_leads = find_leads_module._load_matching_leads(mock_db, 'project_1', [new_lead])
+        
+        self.assertTrue(existing_leads)
+        self.assertEqual(processor.check_duplicate_leads([new_lead], existing_leads), [])
 
 
 if __name__ == '__main__':
@@ -0,0 +1,103 @@
+"""
+Unit tests for job_role_config functions
+
+Tests reading and updating job role configuration for global settings and projects.
+"""
+
+import importlib
+import inspect
+import unittest
+from unittest.mock import patch, Mock
+import sys
+import os
+from firebase_functions import https_fn
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.base_test import FirebaseFunctionsTestCase
+from config_model import GlobalConfig, JobRole, JobRoleConfig, ProjectConfig
+import config_sync as config_sync_module
+import job_role_config as job_role_config_module
+
+
+class TestJobRoleConfig(FirebaseFunctionsTestCase):
+    """Test cases for the job role configuration functions"""
+    
+    def setUp(self):
+        super().setUp()
+        self.global_config = GlobalConfig()
+        self.project_config = ProjectConfig(project_id='test_project_123')
+        
+        self.mock_config_sync = Mock()
+        self.mock_config_sync.load_global_config_from_firebase.return_value = self.global_config
+        self.mock_config_sync.load_project_config_from_firebase.return_value = self.project_config
+        self.mock_config_sync.sync_global_config_to_firebase.return_value = True
+        self.mock_config_sync.sync_project_config_to_firebase.return_value = True
+    
+    def _fresh_job_role_config(self):
+        """Re-import job_role_config the way a cold instance does, before any ConfigSync exists"""
+        with patch.object(config_sync_module, 'config_sync', None):
+            return importlib.reload(job_role_config_module)
+    
+    def test_get_job_roles_config_on_fresh_import(self):
+        """Test that the handler gets its ConfigSync on demand instead of the uninitialised global"""
+        module = self._fresh_job_role_config()
+        request = self.create_callable_request({})
+        
+        with patch.object(module, 'get_config_sync', return_value=self.mock_config_sync):
+            result = inspect.unwrap(module.get_job_roles_config)(request)
+        
+        self.assert_successful_response(result)
+        self.assertTrue(result['config']['is_global'])
+        self.assertEqual(
+            result['config']['target_roles'],
+            [role.value for role in self.global_config.job_roles.target_roles]
+        )
+    
+    def test_update_job_roles_config_on_fresh_import(self):
+        """Test that updating the global roles works before any ConfigSync has been created"""
+        module = self._fresh_job_role_config()
+        request = self.create_callable_request({'target_roles': ['CTO', 'Founder']})
+        
+        with patch.object(module, 'get_config_sync', return_value=self.mock_config_sync):
+            result = inspect.unwrap(module.update_job_roles_config)(request)
+        
+        self.assert_successful_response(result)
+        self.mock_config_sync.sync_global_config_to_firebase.assert_called_once_with(self.global_config)
+        self.assertEqual(self.global_config.job_roles.target_roles, [JobRole.CTO, JobRole.FOUNDER])
+
+    
+    def test_update_project_to_global_roles_without_roles(self):
+        """Test that a project can switch to the global roles without submitting any of its own"""
+        project_roles = JobRoleConfig(target_roles=[JobRole.CEO])
+        self.project_config.use_global_job_roles = False
+        self.project_config.job_roles = project_roles
+        request = self.create_callable_request({
+            'project_id': 'test_project_123',
+            'target_roles': [],
+            'use_global': True
+        })
+        
+        with patch.object(job_role_config_module, 'get_config_sync', return_value=self.mock_config_sync):
+            result = inspect.unwrap(job_role_config_module.update_job_roles_config)(request)
+        
+        self.assert_successful_response(result)
+        self.mock_config_sync.sync_project_config_to_firebase.assert_called_once_with(self.project_config)
+        self.assertTrue(self.project_config.use_global_job_roles)
+        self.assertIs(self.project_config.job_roles, project_roles)
+    
+    def test_update_global_roles_without_roles_is_rejected(self):
+        """Test that the global roles still need at least one role"""
+        request = self.create_callable_request({'target_roles': [], 'custom_roles': []})
+        
+        with patch.object(job_role_config_module, 'get_config_sync', return_value=self.mock_config_sync):
+            with self.assertRaises(https_fn.HttpsError) as context:
+                inspect.unwrap(job_role_config_module.update_job_roles_config)(request)
+        
+        self.assertIn('must have at least one role', context.exception.message)
+        self.mock_config_sync.sync_global_config_to_firebase.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
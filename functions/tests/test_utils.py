@@ -79,6 +79,85 @@ class TestApolloClient(unittest.TestCase):
         self.assertIn('data', result)
 
 
+class TestApolloPagination(unittest.TestCase):
+    """Test cases for multi-page Apollo searches"""
+    
+    def _page(self, page, count, total):
+        return {
+            'people': [{'id': f'p{page}_{i}'} for i in range(count)],
+            'pagination': {'page': page, 'per_page': count, 'total_entries': total}
+        }
+    
+    def test_single_page_does_not_fetch_more(self):
+        """Test that a search satisfied by the first page makes one request"""
+        from utils.api_clients import ApolloClient
+        
+        client = ApolloClient('test_key')
+        with patch.object(client, 'search_people', return_value=self._page(1, 25, 1000)) as mock_search, \
+             patch.object(client, 'asearch_people') as mock_asearch:
+            result = client.search_people_pages(25, page=1, per_page=25)
+        
+        self.assertEqual(len(result['people']), 25)
+        mock_search.assert_called_once()
+        mock_asearch.assert_not_called()
+    
+    def test_remaining_pages_fetched_and_stitched_in_order(self):
+        """Test that later pages are fetched concurrently and appended in page order"""
+        from utils.api_clients import ApolloClient
+        
+        client = ApolloClient('test_key')
+        
+        async def fake_asearch(session, page, per_page, **kwargs):
+            return self._page(page, per_page, 1000)
+        
+        with patch.object(client, 'search_people', return_value=self._page(1, 10, 1000)), \
+             patch.object(client, 'asearch_people', side_effect=fake_asearch):
+            result = client.search_people_pages(25, page=1, per_page=10)
+        
+        ids = [person['id'] for person in result['people']]
+        self.assertEqual(len(ids), 25)
+        self.assertEqual(ids[0], 'p1_0')
+        self.assertEqual(ids[10], 'p2_0')
+        self.assertEqual(ids[20], 'p3_0')
+    
+    def test_rate_limited_page_returns_partial_results(self):
+        """Test that a 429 on a later page keeps earlier pages and reports where to resume"""
+        import requests
+        from utils.api_clients import ApolloClient
+        
+        client = ApolloClient('test_key')
+        
+        async def fake_asearch(session, page, per_page, **kwargs):
+            if page == 3:
+                response = requests.Response()
+                response.status_code = 429
+                response.headers['Retry-After'] = '12'
+                raise requests.HTTPError(response=response)
+            return self._page(page, per_page, 1000)
+        
+        with patch.object(client, 'search_people', return_value=self._page(1, 10, 1000)), \
+             patch.object(client, 'asearch_people', side_effect=fake_asearch):
+            result = client.search_people_pages(40, page=1, per_page=10)
+        
+        self.assertTrue(result['partial'])
+        self.assertEqual(result['next_page'], 3)
+        self.assertEqual(result['retry_after'], 12.0)
+        self.assertEqual(len(result['people']), 20)
+
+
+class TestClientCache(unittest.TestCase):
+    """Test cases for reusing API clients across invocations"""
+    
+    def test_same_key_reuses_client_and_new_key_rebuilds(self):
+        """Test that clients are cached per API key"""
+        from utils.api_clients import ApolloClient, get_cached_client
+        
+        first = get_cached_client(ApolloClient, 'key_one')
+        
+        self.assertIs(get_cached_client(ApolloClient, 'key_one'), first)
+        self.assertIsNot(get_cached_client(ApolloClient, 'key_two'), first)
+
+
 class TestPerplexityClient(unittest.TestCase):
     """Test cases for Perplexity API client"""
     
@@ -306,6 +385,25 @@ class TestFirebaseUtilities(unittest.TestCase):
         
         self.assertEqual(result, mock_client)
         mock_firestore.assert_called_once()
+    
+    @patch.dict(os.environ, {'DEBUG': 'false'})
+    @patch('utils.firebase_utils.get_firestore_client')
+    def test_get_api_keys_from_firebase_is_cached(self, mock_get_client):
+        """Test that API keys are read from Firebase once and copies are returned"""
+        from utils.firebase_utils import get_api_keys, clear_api_keys_cache
+        
+        clear_api_keys_cache()
+        api_keys_doc = mock_get_client.return_value.collection.return_value.document.return_value.get.return_value
+        api_keys_doc.exists = True
+        api_keys_doc.to_dict.return_value = {'apolloApiKey': 'firebase_apollo_key'}
+        
+        first = get_api_keys()
+        first['apollo'] = 'changed'
+        second = get_api_keys()
+        clear_api_keys_cache()
+        
+        self.assertEqual(second['apollo'], 'firebase_apollo_key')
+        mock_get_client.assert_called_once()
 
 
 class TestEmailUtilities(unittest.TestCase):
@@ -372,6 +470,222 @@ class TestDataProcessing(unittest.TestCase):
             
         except ImportError:
             self.skipTest("Data sanitization functions not implemented yet")
+    
+    def test_check_duplicate_leads_by_email_and_linkedin(self):
+        """Test duplicate checking against existing leads and within the batch"""
+        from utils.data_processing import LeadProcessor
+        
+        existing_leads = [
+            {'email': 'Jane@Example.com'},
+            {'email': 'old@example.com', 'linkedinUrl': 'https://www.linkedin.com/in/bob/'}
+        ]
+        new_leads = [
+            {'email': 'jane@example.com'},
+            {'email': 'bob@example.com', 'linkedin_url': 'http://linkedin.com/in/bob'},
+            {'email': 'john@example.com'},
+            {'email': 'JOHN@example.com'},
+            {'email': 'amy@example.com', 'linkedin_url': None}
+        ]
+        
+        result = LeadProcessor().check_duplicate_leads(new_leads, existing_leads)
+        
+        self.assertEqual([lead['email'] for lead in result], ['john@example.com', 'amy@example.com'])
+    
+    def test_process_apollo_results_skips_repeated_people(self):
+        """Test that a person repeated across Apollo pages is processed once"""
+        from utils.data_processing import LeadProcessor
+        
+        person = {'id': 'p1', 'email': 'jane@example.com', 'name': 'Jane Doe', 'organization': {'name': 'Acme'}}
+        other = {'id': 'p2', 'email': 'john@example.com', 'name': 'John Doe', 'organization': {'name': 'Beta'}}
+        
+        result = LeadProcessor().process_apollo_results({'people': [person, other, dict(person)]})
+        
+        self.assertEqual([lead['apollo_id'] for lead in result], ['p1', 'p2'])
+    
+    def test_apply_lead_filters_drops_duplicates(self):
+        """Test that apply_lead_filters can dedupe in the same pass as the other filters"""
+        from utils.data_processing import LeadProcessor
+        from config_model import LeadFilterConfig
+        
+        processor = LeadProcessor()
+        existing_leads = [{'email': 'jane@example.com', 'company': 'Old Co'}]
+        new_leads = [
+            {'email': 'Jane@example.com', 'name': 'Jane Doe', 'company': 'Acme'},
+            {'email': 'john@example.com', 'name': 'John Doe', 'company': 'Acme'},
+            {'email': 'JOHN@example.com', 'name': 'John Doe', 'company': 'Beta'}
+        ]
+        filter_config = LeadFilterConfig(one_person_per_company=True)
+        
+        result, duplicates_dropped = processor.apply_lead_filters(
+            new_leads, filter_config, existing_leads, drop_duplicates=True
+        )
+        
+        # Jane is already stored, so John takes Acme's slot and his repeat is dropped
+        self.assertEqual([lead['email'] for lead in result], ['john@example.com'])
+        self.assertEqual(duplicates_dropped, 2)
+        
+        # The count belongs to the call, so a reused processor reports nothing for an empty batch
+        self.assertEqual(processor.apply_lead_filters([], filter_config, existing_leads, drop_duplicates=True), ([], 0))
+    
+    def test_apply_lead_filters_counts_only_duplicates_passing_other_filters(self):
+        """Test that a duplicate the quality filters would drop is counted as filtered, not as a duplicate"""
+        from utils.data_processing import LeadProcessor
+        from config_model import LeadFilterConfig
+        
+        processor = LeadProcessor()
+        existing_leads = [{'email': 'info@acme.example'}, {'email': 'jane@acme.example'}]
+        new_leads = [
+            {'email': 'info@acme.example', 'name': 'Acme Info', 'company': 'Acme'},
+            {'email': 'jane@acme.example', 'name': 'Jane Doe', 'company': 'Acme'},
+            {'email': 'john@beta.example', 'name': 'John Doe', 'company': 'Beta'}
+        ]
+        
+        result, duplicates_dropped = processor.apply_lead_filters(
+            new_leads, LeadFilterConfig(), existing_leads, drop_duplicates=True
+        )
+        
+        self.assertEqual([lead['email'] for lead in result], ['john@beta.example'])
+        self.assertEqual(duplicates_dropped, 1)
+
+
+class TestCacheUtils(unittest.TestCase):
+    """Test cases for the two-level Firestore cache"""
+    
+    def test_make_cache_key_normalizes_parts(self):
+        """Test that keys ignore case and surrounding whitespace"""
+        from utils.cache_utils import make_cache_key
+        
+        self.assertEqual(make_cache_key(' Acme ', 'John'), make_cache_key('acme', 'john'))
+        self.assertNotEqual(make_cache_key('acme', None), make_cache_key('acme', 'john'))
+    
+    def test_cache_hit_skips_firestore(self):
+        """Test that values set in memory are returned without a Firestore read"""
+        from utils.cache_utils import FirestoreCache
+        
+        cache = FirestoreCache('test_cache', ttl_seconds=60)
+        db = MagicMock()
+        cache.set(db, 'key', {'content': 'cached'})
+        db.reset_mock()
+        
+        self.assertEqual(cache.get(db, 'key'), {'content': 'cached'})
+        db.collection.assert_not_called()
+    
+    def test_cache_lookup_error_is_a_miss(self):
+        """Test that Firestore failures are treated as cache misses"""
+        from utils.cache_utils import FirestoreCache
+        
+        cache = FirestoreCache('test_cache', ttl_seconds=60)
+        db = MagicMock()
+        db.collection.side_effect = Exception('unavailable')
+        
+        self.assertIsNone(cache.get(db, 'missing'))
+
+
+class TestHttpRetry(unittest.TestCase):
+    """Test cases for backoff and Retry-After handling"""
+    
+    @patch('utils.http_retry.time.sleep')
+    @patch('utils.http_retry._http_session.request')
+    def test_retries_rate_limited_request_honouring_retry_after(self, mock_request, mock_sleep):
+        """Test that a 429 is retried after the server's Retry-After delay"""
+        from utils.http_retry import request_with_backoff
+        
+        rate_limited = MagicMock(status_code=429, headers={'Retry-After': '2'})
+        ok = MagicMock(status_code=200, headers={})
+        mock_request.side_effect = [rate_limited, ok]
+        
+        response = request_with_backoff('GET', 'https://api.example.com')
+        
+        self.assertIs(response, ok)
+        self.assertEqual(mock_request.call_count, 2)
+        mock_sleep.assert_called_once_with(2.0)
+    
+    @patch('utils.http_retry.time.sleep')
+    @patch('utils.http_retry._http_session.request')
+    def test_does_not_retry_client_errors(self, mock_request, mock_sleep):
+        """Test that non-retryable statuses fail immediately"""
+        import requests
+        from utils.http_retry import request_with_backoff
+        
+        bad_request = MagicMock(status_code=400, headers={})
+        bad_request.raise_for_status.side_effect = requests.HTTPError('400 Client Error')
+        mock_request.return_value = bad_request
+        
+        with self.assertRaises(requests.HTTPError):
+            request_with_backoff('GET', 'https://api.example.com')
+        
+        self.assertEqual(mock_request.call_count, 1)
+        mock_sleep.assert_not_called()
+    
+    def test_httpx_helper_retries_gateway_errors(self):
+        """Test that the async httpx helper retries a 503 and decodes the JSON body"""
+        import asyncio
+        import httpx
+        from utils.http_retry import ahttpx_request_json_with_backoff
+        
+        statuses = iter([503, 200])
+        
+        def handler(request):
+            status = next(statuses)
+            return httpx.Response(status, json={'ok': status == 200})
+        
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return await ahttpx_request_json_with_backoff(client, 'POST', 'https://api.example.com')
+        
+        with patch('utils.http_retry.backoff_delay', return_value=0):
+            result = asyncio.run(run())
+        
+        self.assertEqual(result, {'ok': True})
+    
+    def test_aimd_limiter_halves_on_rate_limit_and_grows_on_success(self):
+        """Test that the adaptive limiter backs off on 429s and recovers after successes"""
+        import asyncio
+        import httpx
+        from utils.http_retry import AIMDConcurrencyLimiter
+        
+        response = httpx.Response(429, request=httpx.Request('POST', 'https://api.example.com'))
+        rate_limited = httpx.HTTPStatusError('429', request=response.request, response=response)
+        limiter = AIMDConcurrencyLimiter(8, maximum=9)
+        
+        async def run():
+            with self.assertRaises(httpx.HTTPStatusError):
+                async with limiter:
+                    raise rate_limited
+            self.assertEqual(limiter.limit, 4)
+            
+            for _ in range(10):
+                async with limiter:
+                    pass
+        
+        asyncio.run(run())
+        
+        self.assertEqual(limiter.limit, 6)
+    
+    def test_httpx_helper_reports_each_retried_rate_limit(self):
+        """Test that 429s retried inside the helper shrink the adaptive limiter and free its slot"""
+        import asyncio
+        import httpx
+        from utils.http_retry import AIMDConcurrencyLimiter, ahttpx_request_json_with_backoff
+        
+        statuses = iter([429, 429, 200])
+        limiter = AIMDConcurrencyLimiter(8, maximum=16)
+        
+        def handler(request):
+            return httpx.Response(next(statuses), json={'ok': True})
+        
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return await ahttpx_request_json_with_backoff(
+                    client, 'POST', 'https://api.example.com', concurrency_limiter=limiter
+                )
+        
+        with patch('utils.http_retry.backoff_delay', return_value=0):
+            result = asyncio.run(run())
+        
+        self.assertEqual(result, {'ok': True})
+        self.assertEqual(limiter.limit, 2)
+        self.assertEqual(limiter._in_flight, 0)
 
 
 if __name__ == '__main__':
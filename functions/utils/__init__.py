@@ -2,10 +2,18 @@
 Utility modules for Firebase Functions
 """
 
-from .api_clients import ApolloClient, PerplexityClient, OpenAIClient
-from .firebase_utils import get_firestore_client, get_api_keys, get_project_settings, get_project_prompts
+from .api_clients import ApolloClient, PerplexityClient, OpenAIClient, get_cached_client
+from .firebase_utils import (
+    get_firestore_client,
+    get_api_keys,
+    clear_api_keys_cache,
+    config_cache_enabled,
+    get_project_settings,
+    get_project_prompts
+)
 from .email_utils import EmailService, format_email_content
 from .data_processing import LeadProcessor, DataValidator
+from .cache_utils import FirestoreCache, make_cache_key
 from .api_testing import (
     test_apollo_api, 
     test_perplexity_api, 
@@ -20,14 +28,19 @@ __all__ = [
     'ApolloClient',
     'PerplexityClient', 
     'OpenAIClient',
+    'get_cached_client',
     'get_firestore_client',
     'get_api_keys',
+    'clear_api_keys_cache',
+    'config_cache_enabled',
     'get_project_settings',
     'get_project_prompts',
     'EmailService',
     'format_email_content',
     'LeadProcessor',
     'DataValidator',
+    'FirestoreCache',
+    'make_cache_key',
     'test_apollo_api',
     'test_perplexity_api',
     'test_openai_api',
@@ -3,13 +3,76 @@ API client utilities for external services
 """
 
 import os
+import math
+import asyncio
+import hashlib
+import threading
+import httpx
+import orjson
 import requests
 from typing import Dict, List, Optional, Any
 from openai import OpenAI
+from utils.http_retry import (
+    AIMDConcurrencyLimiter,
+    SlidingWindowRateLimiter,
+    get_rate_limit_retry_after,
+    request_with_backoff,
+    ahttpx_request_json_with_backoff
+)
 from utils.logging_config import get_logger
 
 logger = get_logger(__file__)
 
+# Apollo pagination: pages fetched in parallel, and a hard cap on pages per search
+APOLLO_PAGE_CONCURRENCY = 4
+APOLLO_MAX_PAGES = 10
+APOLLO_DEFAULT_TIMEOUT = 60.0
+
+# Perplexity's per-key request budget; shared by every client in this instance
+PERPLEXITY_REQUESTS_PER_MINUTE = 50
+_perplexity_rate_limiter = SlidingWindowRateLimiter(calls=PERPLEXITY_REQUESTS_PER_MINUTE, period=60)
+
+# Perplexity enrichment request template. The model, system message and sampling
+# parameters never vary, so every request shares the same prompt prefix.
+PERPLEXITY_MODEL = "llama-3.1-sonar-small-128k-online"
+PERPLEXITY_MAX_TOKENS = 1000
+PERPLEXITY_DEFAULT_TIMEOUT = 120.0
+PERPLEXITY_TEMPERATURE = 0.2
+PERPLEXITY_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a business research assistant. Provide concise, factual information about companies and people for sales outreach purposes."
+}
+PERPLEXITY_PROMPT_SUFFIX = ". Provide key business information, recent news, company size, industry, and any relevant contact insights."
+
+# Clients reused across warm invocations, keyed by (client class, API key fingerprint)
+_client_cache: Dict[tuple, Any] = {}
+_client_cache_lock = threading.Lock()
+
+
+def get_cached_client(client_cls: type, api_key: str) -> Any:
+    """
+    Get an API client for the given key, reusing the one built by an earlier invocation
+    
+    Clients are keyed by a fingerprint of the API key, so a rotated key gets a
+    fresh client while the old one is simply never used again.
+    
+    Args:
+        client_cls: Client class to instantiate (e.g. ApolloClient)
+        api_key: API key for the client
+        
+    Returns:
+        Client instance
+    """
+    cache_key = (client_cls, hashlib.sha256(api_key.encode('utf-8')).hexdigest())
+    
+    with _client_cache_lock:
+        client = _client_cache.get(cache_key)
+        if client is None:
+            client = client_cls(api_key)
+            _client_cache[cache_key] = client
+    
+    return client
+
 
 class ApolloClient:
     """Client for Apollo.io API"""
@@ -49,6 +112,156 @@ class ApolloClient:
         Returns:
             Dict containing search results
         """
+        url = self._build_search_url(
+            organization_domains=organization_domains,
+            person_titles=person_titles,
+            person_locations=person_locations,
+            organization_locations=organization_locations,
+            contact_email_status=contact_email_status,
+            page=page,
+            per_page=per_page,
+            **kwargs
+        )
+        
+        try:
+            # Log the complete API call details
+            logger.info("🚀 APOLLO API CALL:")
+            logger.info(f"📋 Method: POST")
+            logger.info(f"🔗 URL: {url}")
+            logger.info(f"📤 Headers: {self.headers}")
+            logger.info(f"📦 Body: None (query parameters only)")
+            
+            # POST request with query parameters, no JSON body (rate limits and gateway errors are retried)
+            response = request_with_backoff('POST', url, headers=self.headers)
+            
+            # Log response details
+            logger.info(f"📥 Response Status: {response.status_code}")
+            logger.info(f"📊 Response Size: {len(response.content)} bytes")
+            
+            # orjson decodes the (large) people payload several times faster than response.json()
+            result = orjson.loads(response.content)
+            
+            # Log result summary
+            people_count = len(result.get('people', []))
+            total_available = result.get('pagination', {}).get('total_entries', 0)
+            logger.info(f"✅ Apollo Success: {people_count} people returned, {total_available} total available")
+            
+            return result
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+            logger.error(f"❌ Apollo API error: {e}")
+            logger.error(f"🔗 Failed URL: {url}")
+            logger.error(f"📤 Headers used: {self.headers}")
+            raise
+    
+    @staticmethod
+    def create_session() -> httpx.AsyncClient:
+        """
+        Create an HTTP/2 client for fetching result pages concurrently
+        
+        All pages go to the same host, so they share one multiplexed TLS
+        connection. Must be used inside a running event loop.
+        """
+        return httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=APOLLO_PAGE_CONCURRENCY, max_keepalive_connections=APOLLO_PAGE_CONCURRENCY),
+            timeout=APOLLO_DEFAULT_TIMEOUT
+        )
+    
+    async def asearch_people(self, session: httpx.AsyncClient, **search_params) -> Dict[str, Any]:
+        """
+        Async variant of search_people for fetching several pages concurrently
+        
+        Args:
+            session: Shared HTTP client from create_session()
+            **search_params: Same parameters as search_people
+            
+        Returns:
+            Dict containing search results
+        """
+        url = self._build_search_url(**search_params)
+        
+        try:
+            result = await ahttpx_request_json_with_backoff(session, 'POST', url, headers=self.headers)
+            logger.info(f"✅ Apollo page {search_params.get('page', 1)}: {len(result.get('people', []))} people returned")
+            return result
+        except (httpx.HTTPError, orjson.JSONDecodeError) as e:
+            logger.error(f"❌ Apollo API error on page {search_params.get('page', 1)}: {e}")
+            raise
+    
+    def search_people_pages(self, max_results: int, **search_params) -> Dict[str, Any]:
+        """
+        Search for up to max_results people, fetching as many pages as needed
+        
+        The first page is fetched alone to learn the total number of matches;
+        any further pages are then fetched concurrently and stitched back
+        together in page order.
+        
+        Args:
+            max_results: Maximum number of people to return
+            **search_params: Same parameters as search_people ('page' is the first page to fetch)
+            
+        Returns:
+            Dict containing the first page's response with 'people' from all fetched pages.
+            If a later page is rate limited, the pages before it are returned with
+            'partial' set, plus 'next_page' and 'retry_after' so the caller can resume.
+        """
+        first_page = search_params.pop('page', 1)
+        per_page = search_params.pop('per_page', 25)
+        
+        first = self.search_people(page=first_page, per_page=per_page, **search_params)
+        
+        total_entries = first.get('pagination', {}).get('total_entries', 0)
+        pages_available = math.ceil(max(total_entries - (first_page - 1) * per_page, 0) / per_page)
+        pages_wanted = math.ceil(max_results / per_page)
+        page_count = min(pages_available, pages_wanted, APOLLO_MAX_PAGES)
+        
+        people = list(first.get('people', []))
+        result = {**first, 'partial': False}
+        
+        if page_count > 1:
+            remaining_pages = list(range(first_page + 1, first_page + page_count))
+            page_results = asyncio.run(self._asearch_pages(remaining_pages, per_page, search_params))
+            
+            for page, page_result in zip(remaining_pages, page_results):
+                if isinstance(page_result, BaseException):
+                    retry_after = get_rate_limit_retry_after(page_result)
+                    if retry_after is None:
+                        raise page_result
+                    
+                    # Keep what we already paid for; the caller can resume from this page
+                    logger.warning(f"Apollo rate limited at page {page}, returning {len(people)} people from earlier pages")
+                    result.update({'partial': True, 'next_page': page, 'retry_after': retry_after})
+                    break
+                
+                people.extend(page_result.get('people', []))
+            
+            logger.info(f"✅ Apollo Success: {len(people)} people across {page_count} pages")
+        
+        result['people'] = people[:max_results]
+        return result
+    
+    async def _asearch_pages(self, pages: List[int], per_page: int, search_params: Dict[str, Any]) -> List[Any]:
+        """Fetch the given result pages concurrently, in page order (failed pages are returned as exceptions)"""
+        semaphore = asyncio.Semaphore(APOLLO_PAGE_CONCURRENCY)
+        
+        async with self.create_session() as session:
+            
+            async def fetch_page(page: int) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self.asearch_people(session, page=page, per_page=per_page, **search_params)
+            
+            return await asyncio.gather(*[fetch_page(page) for page in pages], return_exceptions=True)
+    
+    def _build_search_url(self,
+                          organization_domains: List[str] = None,
+                          person_titles: List[str] = None,
+                          person_locations: List[str] = None,
+                          organization_locations: List[str] = None,
+                          contact_email_status: List[str] = None,
+                          page: int = 1,
+                          per_page: int = 25,
+                          **kwargs) -> str:
+        """Build the mixed_people/search URL (Apollo takes search parameters in the query string)"""
         import urllib.parse
         
         base_url = f"{self.base_url}/mixed_people/search"
@@ -96,45 +309,16 @@ class ApolloClient:
             url = f"{base_url}?{'&'.join(params)}"
         else:
             url = base_url
-            
-        try:
-            # Log the complete API call details
-            logger.info("🚀 APOLLO API CALL:")
-            logger.info(f"📋 Method: POST")
-            logger.info(f"🔗 URL: {url}")
-            logger.info(f"📤 Headers: {self.headers}")
-            logger.info(f"📦 Body: None (query parameters only)")
-            
-            # POST request with query parameters, no JSON body
-            response = requests.post(url, headers=self.headers)
-            
-            # Log response details
-            logger.info(f"📥 Response Status: {response.status_code}")
-            logger.info(f"📊 Response Size: {len(response.content)} bytes")
-            
-            response.raise_for_status()
-            result = response.json()
-            
-            # Log result summary
-            people_count = len(result.get('people', []))
-            total_available = result.get('pagination', {}).get('total_entries', 0)
-            logger.info(f"✅ Apollo Success: {people_count} people returned, {total_available} total available")
-            
-            return result
-        except requests.exceptions.RequestException as e:
-            logger.error(f"❌ Apollo API error: {e}")
-            logger.error(f"🔗 Failed URL: {url}")
-            logger.error(f"📤 Headers used: {self.headers}")
-            raise
+        
+        return url
     
     def get_person_details(self, person_id: str) -> Dict[str, Any]:
         """Get detailed information about a specific person"""
         url = f"{self.base_url}/people/{person_id}"
         
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            return response.json()
+            response = request_with_backoff('GET', url, headers=self.headers)
+            return orjson.loads(response.content)
         except requests.exceptions.RequestException as e:
             logger.error(f"Apollo API error getting person details: {e}")
             raise
@@ -147,14 +331,14 @@ class ApolloClient:
         try:
             response = requests.get(url, headers=self.headers)
             if response.status_code == 200:
-                return {"status": "success", "data": response.json()}
+                return {"status": "success", "data": orjson.loads(response.content)}
             else:
                 return {
                     "status": "error", 
                     "code": response.status_code,
                     "message": response.text
                 }
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             return {"status": "error", "message": str(e)}
 
 
@@ -169,10 +353,26 @@ class PerplexityClient:
             "Content-Type": "application/json"
         }
     
+    @staticmethod
+    def create_session() -> httpx.AsyncClient:
+        """
+        Create an HTTP/2 client for concurrent Perplexity requests
+        
+        Every request goes to the same host, so HTTP/2 multiplexes the whole
+        fan-out over a single TLS connection. Must be used inside a running
+        event loop.
+        """
+        return httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=8, max_keepalive_connections=8),
+            timeout=PERPLEXITY_DEFAULT_TIMEOUT
+        )
+    
     def enrich_lead_data(self, 
                         company_name: str,
                         person_name: str = None,
-                        additional_context: str = None) -> Dict[str, Any]:
+                        additional_context: str = None,
+                        timeout: Optional[float] = None) -> Dict[str, Any]:
         """
         Use Perplexity to enrich lead data with additional context
         
@@ -180,10 +380,73 @@ class PerplexityClient:
             company_name: Name of the company
             person_name: Name of the person (optional)
             additional_context: Additional context for enrichment
+            timeout: Request timeout in seconds (optional)
+            
+        Returns:
+            Dict containing enriched data
+        """
+        payload = self._build_enrichment_payload(company_name, person_name, additional_context)
+        
+        try:
+            response = request_with_backoff(
+                'POST',
+                f"{self.base_url}/chat/completions",
+                rate_limiter=_perplexity_rate_limiter,
+                data=orjson.dumps(payload),
+                headers=self.headers,
+                timeout=timeout
+            )
+            return orjson.loads(response.content)
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+            logger.error(f"Perplexity API error: {e}")
+            raise
+    
+    async def aenrich_lead_data(self,
+                                session: httpx.AsyncClient,
+                                company_name: str,
+                                person_name: str = None,
+                                additional_context: str = None,
+                                timeout: Optional[float] = None,
+                                concurrency_limiter: Optional[AIMDConcurrencyLimiter] = None) -> Dict[str, Any]:
+        """
+        Async variant of enrich_lead_data for concurrent enrichment
+        
+        Args:
+            session: Shared HTTP/2 client (see create_session)
+            company_name: Name of the company
+            person_name: Name of the person (optional)
+            additional_context: Additional context for enrichment
+            timeout: Request timeout in seconds (optional)
+            concurrency_limiter: Adaptive concurrency cap shared by the batch (optional)
             
         Returns:
             Dict containing enriched data
         """
+        payload = self._build_enrichment_payload(company_name, person_name, additional_context)
+        request_kwargs = {}
+        if timeout:
+            request_kwargs['timeout'] = timeout
+        
+        try:
+            return await ahttpx_request_json_with_backoff(
+                session,
+                'POST',
+                f"{self.base_url}/chat/completions",
+                rate_limiter=_perplexity_rate_limiter,
+                concurrency_limiter=concurrency_limiter,
+                content=orjson.dumps(payload),
+                headers=self.headers,
+                **request_kwargs
+            )
+        except (httpx.HTTPError, orjson.JSONDecodeError) as e:
+            logger.error(f"Perplexity API error: {e}")
+            raise
+    
+    def _build_enrichment_payload(self,
+                                  company_name: str,
+                                  person_name: str = None,
+                                  additional_context: str = None) -> Dict[str, Any]:
+        """Build the chat completion payload for a lead enrichment request"""
         prompt = f"Research the company '{company_name}'"
         
         if person_name:
@@ -191,36 +454,19 @@ class PerplexityClient:
         
         if additional_context:
             prompt += f". Additional context: {additional_context}"
-            
-        prompt += ". Provide key business information, recent news, company size, industry, and any relevant contact insights."
         
-        payload = {
-            "model": "llama-3.1-sonar-small-128k-online",
+        return {
+            "model": PERPLEXITY_MODEL,
             "messages": [
-                {
-                    "role": "system",
-                    "content": "You are a business research assistant. Provide concise, factual information about companies and people for sales outreach purposes."
-                },
+                PERPLEXITY_SYSTEM_MESSAGE,
                 {
                     "role": "user", 
-                    "content": prompt
+                    "content": prompt + PERPLEXITY_PROMPT_SUFFIX
                 }
             ],
-            "max_tokens": 1000,
-            "temperature": 0.2
+            "max_tokens": PERPLEXITY_MAX_TOKENS,
+            "temperature": PERPLEXITY_TEMPERATURE
         }
-        
-        try:
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                json=payload,
-                headers=self.headers
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Perplexity API error: {e}")
-            raise
 
 
 class OpenAIClient:
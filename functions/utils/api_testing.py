@@ -6,10 +6,14 @@ in a production environment. Can be used by Firebase Functions to check
 API health and troubleshoot issues.
 """
 
-import logging
+import asyncio
+import orjson
 import requests
 from typing import Dict, Any, Optional
 from .api_clients import ApolloClient, PerplexityClient, OpenAIClient
+from .logging_config import get_logger
+
+logger = get_logger(__file__)
 
 
 def test_apollo_api(api_key: str, minimal: bool = True) -> Dict[str, Any]:
@@ -53,7 +57,7 @@ def test_apollo_api(api_key: str, minimal: bool = True) -> Dict[str, Any]:
             }
             
     except Exception as e:
-        logging.error(f"Apollo API test failed: {e}")
+        logger.error(f"Apollo API test failed: {e}")
         return {
             'status': 'error',
             'api': 'apollo',
@@ -104,7 +108,7 @@ def test_perplexity_api(api_key: str, minimal: bool = True) -> Dict[str, Any]:
             }
             
     except Exception as e:
-        logging.error(f"Perplexity API test failed: {e}")
+        logger.error(f"Perplexity API test failed: {e}")
         return {
             'status': 'error',
             'api': 'perplexity',
@@ -134,7 +138,7 @@ def test_openai_api(api_key: str, minimal: bool = True) -> Dict[str, Any]:
         # Test basic API access first
         response = requests.get("https://api.openai.com/v1/models", headers=headers)
         response.raise_for_status()
-        models_data = response.json()
+        models_data = orjson.loads(response.content)
         
         # Check if GPT models are available
         available_models = [model['id'] for model in models_data.get('data', [])]
@@ -207,7 +211,7 @@ def test_openai_api(api_key: str, minimal: bool = True) -> Dict[str, Any]:
                 }
             
     except Exception as e:
-        logging.error(f"OpenAI API test failed: {e}")
+        logger.error(f"OpenAI API test failed: {e}")
         
         # Check if it's an authentication error
         if "401" in str(e) or "unauthorized" in str(e).lower():
@@ -227,6 +231,34 @@ def test_openai_api(api_key: str, minimal: bool = True) -> Dict[str, Any]:
             }
 
 
+async def _run_api_tests(api_keys: Dict[str, str], minimal: bool) -> Dict[str, Dict[str, Any]]:
+    """
+    Run the individual API tests concurrently
+    
+    Each test is a blocking network check, so they run in worker threads and the
+    total time is roughly that of the slowest API rather than the sum.
+    
+    Args:
+        api_keys: Dict with keys 'apollo', 'perplexity', 'openai'
+        minimal: If True, use minimal requests to save credits
+        
+    Returns:
+        Dict mapping API name to its test result (only APIs with a key are tested)
+    """
+    api_tests = {
+        'apollo': test_apollo_api,
+        'perplexity': test_perplexity_api,
+        'openai': test_openai_api
+    }
+    
+    api_names = [api_name for api_name in api_tests if api_keys.get(api_name)]
+    outcomes = await asyncio.gather(*[
+        asyncio.to_thread(api_tests[api_name], api_keys[api_name], minimal)
+        for api_name in api_names
+    ])
+    return dict(zip(api_names, outcomes))
+
+
 def test_all_apis(api_keys: Dict[str, str], minimal: bool = True) -> Dict[str, Any]:
     """
     Test all APIs and return comprehensive status
@@ -238,47 +270,20 @@ def test_all_apis(api_keys: Dict[str, str], minimal: bool = True) -> Dict[str, A
     Returns:
         Dict with overall status and individual API results
     """
+    tested = asyncio.run(_run_api_tests(api_keys, minimal))
+    
     results = {}
     overall_status = 'success'
     
-    # Test Apollo
-    if api_keys.get('apollo'):
-        results['apollo'] = test_apollo_api(api_keys['apollo'], minimal)
-        if results['apollo']['status'] != 'success':
-            overall_status = 'partial'
-    else:
-        results['apollo'] = {
-            'status': 'error',
-            'api': 'apollo',
-            'message': 'Apollo API key not provided'
-        }
-        overall_status = 'partial'
-    
-    # Test Perplexity
-    if api_keys.get('perplexity'):
-        results['perplexity'] = test_perplexity_api(api_keys['perplexity'], minimal)
-        if results['perplexity']['status'] != 'success':
-            overall_status = 'partial'
-    else:
-        results['perplexity'] = {
-            'status': 'error',
-            'api': 'perplexity',
-            'message': 'Perplexity API key not provided'
-        }
-        overall_status = 'partial'
-    
-    # Test OpenAI
-    if api_keys.get('openai'):
-        results['openai'] = test_openai_api(api_keys['openai'], minimal)
-        if results['openai']['status'] not in ['success', 'partial']:
-            overall_status = 'partial'
-    else:
-        results['openai'] = {
-            'status': 'error',
-            'api': 'openai',
-            'message': 'OpenAI API key not provided'
-        }
-        overall_status = 'partial'
+    for api_name, display_name in [('apollo', 'Apollo'), ('perplexity', 'Perplexity'), ('openai', 'OpenAI')]:
+        if api_name in tested:
+            results[api_name] = tested[api_name]
+        else:
+            results[api_name] = {
+                'status': 'error',
+                'api': api_name,
+                'message': f'{display_name} API key not provided'
+            }
     
     # Count successful APIs (including partial success)
     successful_apis = sum(1 for result in results.values() if result['status'] in ['success', 'partial'])
@@ -398,7 +403,7 @@ def test_workflow_integration(api_keys: Dict[str, str]) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        logging.error(f"Workflow integration test failed: {e}")
+        logger.error(f"Workflow integration test failed: {e}")
         return {
             'status': 'error',
             'message': f'Workflow test failed: {str(e)}',
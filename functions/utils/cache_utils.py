@@ -0,0 +1,103 @@
+"""
+Caching utilities for expensive external lookups
+"""
+
+import hashlib
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+from cachetools import TTLCache
+from firebase_admin import firestore
+from utils.logging_config import get_logger
+
+logger = get_logger(__file__)
+
+
+def make_cache_key(*parts: Optional[str]) -> str:
+    """
+    Build a stable cache key from the given parts
+    
+    Parts are stripped and lowercased so trivially different inputs share an entry.
+    
+    Args:
+        *parts: Key components (None is treated as empty)
+    
+    Returns:
+        SHA-1 hex digest usable as a Firestore document ID
+    """
+    normalized = '|'.join((part or '').strip().lower() for part in parts)
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+
+class FirestoreCache:
+    """Two-level cache: in-process TTL/LRU in front of a Firestore collection"""
+    
+    def __init__(self, collection: str, ttl_seconds: int, maxsize: int = 512):
+        self.collection = collection
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self._memory = TTLCache(maxsize=maxsize, ttl=ttl_seconds)
+        # cachetools caches are not thread-safe; Firestore round-trips stay outside the lock
+        self._lock = threading.Lock()
+    
+    def get(self, db, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached value
+        
+        Args:
+            db: Firestore client
+            key: Cache key (see make_cache_key)
+        
+        Returns:
+            Cached value dict, or None on a miss or expired entry
+        """
+        with self._lock:
+            value = self._memory.get(key)
+        if value is not None:
+            return value
+        
+        try:
+            doc = db.collection(self.collection).document(key).get()
+            if not doc.exists:
+                return None
+            
+            data = doc.to_dict()
+            cached_at = data.get('cached_at')
+            if not isinstance(cached_at, datetime):
+                return None
+            if cached_at.tzinfo is None:
+                cached_at = cached_at.replace(tzinfo=timezone.utc)
+            if datetime.now(timezone.utc) - cached_at >= self.ttl:
+                return None
+            
+            value = data.get('value')
+            if not isinstance(value, dict):
+                return None
+            
+            with self._lock:
+                self._memory[key] = value
+            return value
+        
+        except Exception as e:
+            # A broken cache must never break the caller - treat it as a miss
+            logger.warning(f"Cache lookup failed in {self.collection}: {e}")
+            return None
+    
+    def set(self, db, key: str, value: Dict[str, Any]) -> None:
+        """
+        Store a value in both cache levels
+        
+        Args:
+            db: Firestore client
+            key: Cache key (see make_cache_key)
+            value: JSON-compatible dict to cache
+        """
+        with self._lock:
+            self._memory[key] = value
+        
+        try:
+            db.collection(self.collection).document(key).set({
+                'value': value,
+                'cached_at': firestore.SERVER_TIMESTAMP
+            })
+        except Exception as e:
+            logger.warning(f"Cache write failed in {self.collection}: {e}")
@@ -3,13 +3,16 @@ Data processing utilities for lead management
 """
 
 import re
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union, Any
 from datetime import datetime
 from config_model import LeadFilterConfig
 from utils.logging_config import get_logger
 
 logger = get_logger(__file__)
 
+# Compiled once; validate_email runs for every lead Apollo returns
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
 
 class DataValidator:
     """Utility class for data validation"""
@@ -28,8 +31,7 @@ class DataValidator:
         if not email:
             return False
         
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email.strip()))
+        return bool(EMAIL_PATTERN.match(email.strip()))
     
     @staticmethod
     def validate_lead_data(lead_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -88,7 +90,7 @@ class DataValidator:
             cleaned['company'] = lead_data['company'].strip()
         
         # Copy other fields
-        for key in ['source', 'notes', 'projectId']:
+        for key in ['source', 'notes', 'projectId', 'apollo_id', 'title', 'linkedin_url']:
             if lead_data.get(key):
                 cleaned[key] = lead_data[key]
         
@@ -105,6 +107,9 @@ class LeadProcessor:
         """
         Process Apollo.io search results into lead format
         
+        A person returned more than once (pages can overlap when results shift
+        between requests) is only processed the first time.
+        
         Args:
             apollo_response: Response from Apollo.io API
             
@@ -112,15 +117,23 @@ class LeadProcessor:
             List of processed lead dictionaries
         """
         leads = []
+        seen_ids = set()
         
         try:
             people = apollo_response.get('people', [])
             
             for person in people:
+                person_id = person.get('id')
+                if person_id:
+                    if person_id in seen_ids:
+                        continue
+                    seen_ids.add(person_id)
+                
+                organization = person.get('organization') or {}
                 lead_data = {
                     'email': person.get('email'),
                     'name': person.get('name'),
-                    'company': person.get('organization', {}).get('name') if person.get('organization') else None,
+                    'company': organization.get('name'),
                     'source': 'Apollo.io',
                     'apollo_id': person.get('id'),
                     'title': person.get('title'),
@@ -134,7 +147,7 @@ class LeadProcessor:
                     cleaned_lead = self.validator.clean_lead_data(lead_data)
                     leads.append(cleaned_lead)
                 else:
-                    logger.warning(f"Invalid lead data: {validation['errors']}")
+                    logger.warning("Invalid lead data: %s", validation['errors'])
             
         except Exception as e:
             logger.error(f"Error processing Apollo results: {e}")
@@ -258,13 +271,22 @@ class LeadProcessor:
         if lead_data.get('linkedin_url'):
             db_lead['linkedinUrl'] = lead_data['linkedin_url']
         
+        # Normalized identity fields let duplicate lookups query exact matches
+        email_normalized, linkedin_url_normalized = self.lead_identity(lead_data)
+        db_lead['emailNormalized'] = email_normalized
+        if linkedin_url_normalized:
+            db_lead['linkedinUrlNormalized'] = linkedin_url_normalized
+        
         return db_lead
     
     def check_duplicate_leads(self, 
                              new_leads: List[Dict[str, Any]], 
                              existing_leads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        Filter out duplicate leads based on email
+        Filter out duplicate leads based on email or LinkedIn profile
+        
+        Leads are checked against the existing leads and against each other, so a
+        person returned twice in the same batch is only kept once.
         
         Args:
             new_leads: List of new leads to check
@@ -273,22 +295,66 @@ class LeadProcessor:
         Returns:
             List of unique new leads
         """
-        existing_emails = {lead.get('email', '').lower() for lead in existing_leads}
+        seen_emails, seen_linkedin_urls = self._existing_identities(existing_leads)
         
         unique_leads = []
         for lead in new_leads:
-            if lead.get('email', '').lower() not in existing_emails:
-                unique_leads.append(lead)
-            else:
-                logger.info(f"Duplicate lead found: {lead.get('email')}")
+            email, linkedin_url = self.lead_identity(lead)
+            
+            if email in seen_emails or linkedin_url in seen_linkedin_urls:
+                logger.info("Duplicate lead found: %s", lead.get('email'))
+                continue
+            
+            unique_leads.append(lead)
+            self._remember_identity(email, linkedin_url, seen_emails, seen_linkedin_urls)
         
         return unique_leads
     
+    def _existing_identities(self, existing_leads: List[Dict[str, Any]]) -> Tuple[Set[str], Set[str]]:
+        """Collect the normalized emails and LinkedIn URLs of stored leads"""
+        seen_emails = {
+            (lead.get('email') or '').strip().lower()
+            for lead in existing_leads
+        }
+        seen_emails.discard('')
+        seen_linkedin_urls = {
+            self._normalize_linkedin_url(lead.get('linkedinUrl') or lead.get('linkedin_url'))
+            for lead in existing_leads
+        }
+        seen_linkedin_urls.discard('')
+        return seen_emails, seen_linkedin_urls
+    
+    @classmethod
+    def lead_identity(cls, lead: Dict[str, Any]) -> Tuple[str, str]:
+        """Normalized (email, LinkedIn URL) of a processed lead, empty strings when missing"""
+        return (lead.get('email') or '').strip().lower(), cls._normalize_linkedin_url(lead.get('linkedin_url'))
+    
+    @staticmethod
+    def _remember_identity(email: str, linkedin_url: str, seen_emails: Set[str], seen_linkedin_urls: Set[str]) -> None:
+        """Record a kept lead so later leads in the same batch count as duplicates"""
+        if email:
+            seen_emails.add(email)
+        if linkedin_url:
+            seen_linkedin_urls.add(linkedin_url)
+    
+    @staticmethod
+    def _normalize_linkedin_url(url: Optional[str]) -> str:
+        """Normalize a LinkedIn profile URL for comparison (scheme, host prefix and trailing slash ignored)"""
+        if not url:
+            return ''
+        
+        normalized = url.strip().lower().rstrip('/')
+        for prefix in ('https://', 'http://', 'www.'):
+            if normalized.startswith(prefix):
+                normalized = normalized[len(prefix):]
+        return normalized
+    
     def apply_lead_filters(self, 
                           leads: List[Dict[str, Any]], 
                           filter_config: LeadFilterConfig,
                           existing_leads: List[Dict[str, Any]] = None,
-                          blacklisted_emails: List[str] = None) -> List[Dict[str, Any]]:
+                          blacklisted_emails: Iterable[str] = None,
+                          drop_duplicates: bool = False) -> Union[List[Dict[str, Any]], Tuple[List[Dict[str, Any]], int]]:
         """
         Apply comprehensive lead filtering based on configuration
         
@@ -296,31 +362,57 @@ class LeadProcessor:
             leads: List of leads to filter
             filter_config: Lead filter configuration
             existing_leads: Existing leads for duplicate checking
-            blacklisted_emails: List of blacklisted email addresses
+            blacklisted_emails: Blacklisted email addresses (a frozenset is used as-is
+                and must already be lowercased)
+            drop_duplicates: Also drop people already in existing_leads or repeated in
+                this batch, as check_duplicate_leads does, in the same pass
             
         Returns:
-            List of filtered leads
+            List of filtered leads, or with drop_duplicates a (filtered_leads, duplicates_dropped)
+            tuple. Only duplicates that pass the size and quality filters are counted, so
+            len(filtered_leads) + duplicates_dropped is the number of leads that passed the
+            non-duplicate filters (a duplicate is never subject to the company filter).
         """
         if not leads:
-            return []
+            return ([], 0) if drop_duplicates else []
         
         filtered_leads = []
         company_tracker = {}
         
         existing_leads = existing_leads or []
-        blacklisted_emails = blacklisted_emails or []
-        blacklisted_set = {email.lower() for email in blacklisted_emails}
+        if isinstance(blacklisted_emails, frozenset):
+            blacklisted_set = blacklisted_emails
+        else:
+            blacklisted_set = {email.lower() for email in blacklisted_emails or []}
+        existing_companies = {
+            self._normalize_company_name(existing_lead.get('company', ''))
+            for existing_lead in existing_leads
+        }
+        duplicates_dropped = 0
+        if drop_duplicates:
+            seen_emails, seen_linkedin_urls = self._existing_identities(existing_leads)
         
         for lead in leads:
             # Filter by email requirement
             if filter_config.require_email and not lead.get('email'):
-                logger.debug(f"Filtered lead without email: {lead.get('name', 'Unknown')}")
+                logger.debug("Filtered lead without email: %s", lead.get('name', 'Unknown'))
                 continue
             
             # Filter blacklisted emails
             if filter_config.exclude_blacklisted and lead.get('email'):
                 if lead['email'].lower() in blacklisted_set:
-                    logger.debug(f"Filtered blacklisted email: {lead['email']}")
+                    logger.debug("Filtered blacklisted email: %s", lead['email'])
+                    continue
+            
+            # Filter people already in the project or earlier in this batch (checked before the
+            # company filter so a duplicate can't take its company's slot)
+            if drop_duplicates:
+                email, linkedin_url = self.lead_identity(lead)
+                if email in seen_emails or linkedin_url in seen_linkedin_urls:
+                    logger.info("Duplicate lead found: %s", lead.get('email'))
+                    # Leads the other per-lead filters would drop count as filtered, not as duplicates
+                    if not self._should_filter_by_company_size(lead, filter_config) and self._passes_quality_filters(lead):
+                        duplicates_dropped += 1
                     continue
             
             # Filter one person per company
@@ -329,30 +421,33 @@ class LeadProcessor:
                 
                 # Check if we already have someone from this company
                 if company_name in company_tracker:
-                    logger.debug(f"Filtered duplicate company: {lead['company']}")
+                    logger.debug("Filtered duplicate company: %s", lead['company'])
                     continue
                 
                 # Check against existing leads
-                if any(self._normalize_company_name(existing_lead.get('company', '')) == company_name 
-                       for existing_lead in existing_leads):
-                    logger.debug(f"Filtered company already in existing leads: {lead['company']}")
+                if company_name in existing_companies:
+                    logger.debug("Filtered company already in existing leads: %s", lead['company'])
                     continue
                 
                 company_tracker[company_name] = True
             
             # Filter by company size (if data is available)
             if self._should_filter_by_company_size(lead, filter_config):
-                logger.debug(f"Filtered by company size: {lead.get('company', 'Unknown')}")
+                logger.debug("Filtered by company size: %s", lead.get('company', 'Unknown'))
                 continue
             
             # Add additional quality filters
             if not self._passes_quality_filters(lead):
-                logger.debug(f"Filtered by quality checks: {lead.get('email', 'Unknown')}")
+                logger.debug("Filtered by quality checks: %s", lead.get('email', 'Unknown'))
                 continue
             
             filtered_leads.append(lead)
+            if drop_duplicates:
+                self._remember_identity(email, linkedin_url, seen_emails, seen_linkedin_urls)
         
         logger.info(f"Lead filtering results: {len(leads)} -> {len(filtered_leads)} after applying filters")
+        if drop_duplicates:
+            return filtered_leads, duplicates_dropped
         return filtered_leads
     
     def _normalize_company_name(self, company_name: str) -> str:
@@ -3,7 +3,9 @@ Firebase utility functions
 """
 
 import os
+import threading
 from typing import Dict, Optional
+from cachetools import TTLCache
 from firebase_admin import firestore
 from dotenv import load_dotenv
 from utils.logging_config import get_logger
@@ -13,6 +15,22 @@ logger = get_logger(__file__)
 # Load environment variables for local development
 load_dotenv()
 
+# API keys read from Firebase, reused across warm invocations. Rotated keys are
+# picked up after the TTL (or immediately on this instance via clear_api_keys_cache).
+API_KEYS_CACHE_TTL_SECONDS = 300
+_api_keys_cache = TTLCache(maxsize=1, ttl=API_KEYS_CACHE_TTL_SECONDS)
+_api_keys_cache_lock = threading.Lock()
+
+
+def config_cache_enabled() -> bool:
+    """
+    Tell whether settings may be served from the per-instance caches
+    
+    Set KIM_DISABLE_CONFIG_CACHE=true to always read API keys, configs,
+    projects and the blacklist from Firebase.
+    """
+    return os.getenv('KIM_DISABLE_CONFIG_CACHE', '').lower() not in ('1', 'true', 'yes')
+
 
 def get_firestore_client():
     """Get Firestore client instance"""
@@ -39,18 +57,29 @@ def get_api_keys(use_env: bool = False) -> Dict[str, str]:
         }
     else:
         # Use Firebase for production
+        use_cache = config_cache_enabled()
+        if use_cache:
+            with _api_keys_cache_lock:
+                cached_keys = _api_keys_cache.get('apiKeys')
+            if cached_keys is not None:
+                return dict(cached_keys)
+        
         try:
             db = get_firestore_client()
             api_keys_doc = db.collection('settings').document('apiKeys').get()
             
             if api_keys_doc.exists:
                 data = api_keys_doc.to_dict()
-                return {
+                api_keys = {
                     'openai': data.get('openaiApiKey'),
                     'apollo': data.get('apolloApiKey'),
                     'apifi': data.get('apifiApiKey'),
                     'perplexity': data.get('perplexityApiKey')
                 }
+                if use_cache:
+                    with _api_keys_cache_lock:
+                        _api_keys_cache['apiKeys'] = api_keys
+                return dict(api_keys)
             else:
                 logger.warning("API keys document not found in Firebase")
                 return {}
@@ -59,6 +88,12 @@ def get_api_keys(use_env: bool = False) -> Dict[str, str]:
             return {}
 
 
+def clear_api_keys_cache() -> None:
+    """Forget cached API keys so the next get_api_keys call reads Firebase"""
+    with _api_keys_cache_lock:
+        _api_keys_cache.clear()
+
+
 def get_smtp_settings(use_env: bool = False) -> Dict[str, any]:
     """
     Get SMTP settings from Firebase or environment variables
@@ -0,0 +1,298 @@
+"""
+Retry and rate limiting helpers for outbound API calls
+
+Transient failures (rate limiting and gateway errors) are retried with jittered
+exponential backoff, honouring the server's Retry-After header when present.
+Any other error is raised immediately.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Optional
+import httpx
+import openai
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from utils.logging_config import get_logger
+
+logger = get_logger(__file__)
+
+# Status codes worth retrying - everything else is a caller or server bug
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+DEFAULT_MAX_TRIES = 5
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_CAP_SECONDS = 30.0
+
+# One pooled session per instance so warm invocations reuse open TCP/TLS connections
+_http_session = requests.Session()
+_http_session.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=16))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value
+    
+    Args:
+        value: Header value, either delta-seconds or an HTTP date
+    
+    Returns:
+        Seconds to wait, or None if the header is missing or malformed
+    """
+    if not value:
+        return None
+    
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def get_rate_limit_retry_after(error: BaseException) -> Optional[float]:
+    """
+    Tell whether an exception is an upstream rate limit (HTTP 429)
+    
+    Works for errors raised by requests, httpx and the OpenAI SDK.
+    
+    Args:
+        error: Exception raised by an API call
+    
+    Returns:
+        Seconds the caller should wait before retrying, or None if this is not a rate limit
+    """
+    if isinstance(error, (requests.HTTPError, httpx.HTTPStatusError)) and error.response is not None:
+        status, headers = error.response.status_code, error.response.headers
+    elif isinstance(error, openai.APIStatusError):
+        status, headers = error.status_code, error.response.headers
+    else:
+        return None
+    
+    if status != 429:
+        return None
+    
+    retry_after = parse_retry_after(headers.get('Retry-After'))
+    return retry_after if retry_after is not None else BACKOFF_CAP_SECONDS
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """
+    Compute how long to wait before the next attempt
+    
+    Args:
+        attempt: Number of attempts made so far (1-based)
+        retry_after: Server-provided Retry-After in seconds (takes precedence)
+    
+    Returns:
+        Delay in seconds (full jitter over an exponentially growing window)
+    """
+    if retry_after is not None:
+        return min(retry_after, BACKOFF_CAP_SECONDS)
+    return random.uniform(0, min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (attempt - 1)))
+
+
+def request_with_backoff(method: str,
+                         url: str,
+                         max_tries: int = DEFAULT_MAX_TRIES,
+                         rate_limiter: Optional['SlidingWindowRateLimiter'] = None,
+                         **kwargs) -> requests.Response:
+    """
+    Send an HTTP request, retrying rate-limited and gateway failures
+    
+    Args:
+        method: HTTP method
+        url: Request URL
+        max_tries: Maximum number of attempts
+        rate_limiter: Limiter to acquire before every attempt (optional)
+        **kwargs: Passed through to requests.Session.request
+    
+    Returns:
+        Successful response
+    
+    Raises:
+        requests.HTTPError: For non-retryable statuses or once attempts are exhausted
+        requests.RequestException: For connection-level failures
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        if rate_limiter:
+            rate_limiter.acquire()
+        
+        response = _http_session.request(method, url, **kwargs)
+        
+        if response.status_code not in RETRYABLE_STATUS_CODES or attempt >= max_tries:
+            response.raise_for_status()
+            return response
+        
+        delay = backoff_delay(attempt, parse_retry_after(response.headers.get('Retry-After')))
+        logger.warning(f"{method} {url} returned {response.status_code}, retrying in {delay:.1f}s (attempt {attempt}/{max_tries})")
+        time.sleep(delay)
+
+
+async def ahttpx_request_json_with_backoff(client: httpx.AsyncClient,
+                                           method: str,
+                                           url: str,
+                                           max_tries: int = DEFAULT_MAX_TRIES,
+                                           rate_limiter: Optional['SlidingWindowRateLimiter'] = None,
+                                           concurrency_limiter: Optional['AIMDConcurrencyLimiter'] = None,
+                                           **kwargs) -> Any:
+    """
+    Async variant of request_with_backoff that returns the decoded JSON body
+    
+    Args:
+        client: httpx async client
+        method: HTTP method
+        url: Request URL
+        max_tries: Maximum number of attempts
+        rate_limiter: Limiter to acquire before every attempt (optional)
+        concurrency_limiter: Adaptive limiter holding a slot for each attempt, but not
+            for the backoff in between, and told about every 429 (optional)
+        **kwargs: Passed through to client.request
+    
+    Returns:
+        Decoded JSON response body
+    
+    Raises:
+        httpx.HTTPStatusError: For non-retryable statuses or once attempts are exhausted
+        httpx.HTTPError: For connection-level failures
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        if rate_limiter:
+            await rate_limiter.aacquire()
+        
+        if concurrency_limiter:
+            await concurrency_limiter.acquire()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except BaseException:
+            if concurrency_limiter:
+                await concurrency_limiter.release(succeeded=False)
+            raise
+        if concurrency_limiter:
+            await concurrency_limiter.release(succeeded=response.is_success,
+                                              rate_limited=response.status_code == 429)
+        
+        if response.status_code not in RETRYABLE_STATUS_CODES or attempt >= max_tries:
+            response.raise_for_status()
+            return orjson.loads(response.content)
+        
+        delay = backoff_delay(attempt, parse_retry_after(response.headers.get('Retry-After')))
+        logger.warning(f"{method} {url} returned {response.status_code}, retrying in {delay:.1f}s (attempt {attempt}/{max_tries})")
+        await asyncio.sleep(delay)
+
+
+class SlidingWindowRateLimiter:
+    """
+    Allow at most `calls` acquisitions in any `period`-second window
+    
+    Safe to share between threads and between event loops (each Cloud Function
+    invocation runs its own asyncio.run loop).
+    """
+    
+    def __init__(self, calls: int, period: float = 60.0):
+        self.calls = calls
+        self.period = period
+        self._timestamps = deque()
+        self._lock = threading.Lock()
+    
+    def _reserve(self) -> float:
+        """Take a slot if one is free, otherwise return how long to wait for one"""
+        with self._lock:
+            now = time.monotonic()
+            while self._timestamps and now - self._timestamps[0] >= self.period:
+                self._timestamps.popleft()
+            
+            if len(self._timestamps) < self.calls:
+                self._timestamps.append(now)
+                return 0.0
+            
+            return self.period - (now - self._timestamps[0])
+    
+    def acquire(self) -> None:
+        """Block until a call is allowed"""
+        while True:
+            wait = self._reserve()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+    
+    async def aacquire(self) -> None:
+        """Wait (without blocking the event loop) until a call is allowed"""
+        while True:
+            wait = self._reserve()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+
+class AIMDConcurrencyLimiter:
+    """
+    Async concurrency cap that adapts to upstream rate limiting
+    
+    The limit grows by one after a full window of successful calls and halves
+    whenever a call fails with HTTP 429 (additive increase, multiplicative decrease).
+    Use one instance per event loop, as an async context manager around each call,
+    or pass it to ahttpx_request_json_with_backoff so every retried 429 counts.
+    """
+    
+    def __init__(self, initial: int, minimum: int = 1, maximum: Optional[int] = None):
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum if maximum is not None else initial
+        self._in_flight = 0
+        self._successes = 0
+        self._condition = asyncio.Condition()
+    
+    async def acquire(self) -> None:
+        """Wait until a slot is free and take it"""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+    
+    async def release(self, succeeded: bool, rate_limited: bool = False) -> None:
+        """
+        Give a slot back and adapt the limit to how the call went
+        
+        Args:
+            succeeded: The call completed successfully
+            rate_limited: The call was answered with HTTP 429
+        """
+        async with self._condition:
+            self._in_flight -= 1
+            
+            if succeeded:
+                self._successes += 1
+                if self._successes >= self.limit and self.limit < self.maximum:
+                    self.limit += 1
+                    self._successes = 0
+            elif rate_limited:
+                self.limit = max(self.minimum, self.limit // 2)
+                self._successes = 0
+                logger.warning("Rate limited upstream, reducing concurrency to %d", self.limit)
+            
+            self._condition.notify_all()
+    
+    async def __aenter__(self) -> 'AIMDConcurrencyLimiter':
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        await self.release(succeeded=exc is None,
+                           rate_limited=exc is not None and get_rate_limit_retry_after(exc) is not None)
+        return False